@@ -0,0 +1,20 @@
+-- 021_obsidian_export_targets.sql
+-- Per-target Obsidian export state.
+-- scripts/obsidian_export.py renders each note once and fans it out to several
+-- vault targets (production vault, vault-test, mobile subset). A row here means
+-- the note has been handled for that target; raw_notes.exported_to_obsidian is
+-- still set once every configured target is done.
+
+CREATE TABLE IF NOT EXISTS obsidian_exports (
+    raw_note_id INTEGER NOT NULL,
+    target TEXT NOT NULL,  -- Vault target name, e.g. 'default', 'vault-test', 'mobile'
+    exported_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (raw_note_id, target),
+    FOREIGN KEY (raw_note_id) REFERENCES raw_notes(id) ON DELETE CASCADE
+);
+
+-- Notes exported before this migration count as done for the default target
+INSERT OR IGNORE INTO obsidian_exports (raw_note_id, target, exported_at)
+SELECT id, 'default', COALESCE(exported_at, CURRENT_TIMESTAMP)
+FROM raw_notes
+WHERE exported_to_obsidian = 1;
@@ -0,0 +1,11 @@
+-- 022_export_leases.sql
+-- Lease-based claiming for Obsidian export workers.
+-- scripts/obsidian_export.py claims notes with UPDATE ... RETURNING before
+-- exporting them, so a cron batch and a webhook call (or several --workers)
+-- never export the same note twice. A lease that expires without being
+-- released (crashed worker) is simply claimed again by the next worker.
+
+ALTER TABLE raw_notes ADD COLUMN export_claimed_by TEXT;  -- worker id, e.g. 'hostname:pid'
+ALTER TABLE raw_notes ADD COLUMN export_lease_expires_at TEXT;  -- datetime('now') format
+
+CREATE INDEX IF NOT EXISTS idx_raw_notes_export_claim ON raw_notes(export_claimed_by, export_lease_expires_at);
@@ -0,0 +1,41 @@
+-- 023_raw_notes_fts.sql
+-- Full-text index over raw_notes (title, content, tags).
+-- External-content FTS5 table kept in sync by triggers, so keyword search and
+-- BM25-ranked related-note lookups no longer need a LIKE scan of raw_notes.
+-- scripts/obsidian_export.py falls back to it for notes without embeddings.
+-- The tokenizer is unstemmed so the plain words the exporter picks out of a
+-- note match index terms exactly.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS raw_notes_fts USING fts5(
+    title,
+    content,
+    tags,
+    content = 'raw_notes',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS raw_notes_fts_insert AFTER INSERT ON raw_notes BEGIN
+    INSERT INTO raw_notes_fts (rowid, title, content, tags)
+    VALUES (new.id, new.title, new.content, new.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS raw_notes_fts_delete AFTER DELETE ON raw_notes BEGIN
+    INSERT INTO raw_notes_fts (raw_notes_fts, rowid, title, content, tags)
+    VALUES ('delete', old.id, old.title, old.content, old.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS raw_notes_fts_update AFTER UPDATE OF title, content, tags ON raw_notes BEGIN
+    INSERT INTO raw_notes_fts (raw_notes_fts, rowid, title, content, tags)
+    VALUES ('delete', old.id, old.title, old.content, old.tags);
+    INSERT INTO raw_notes_fts (rowid, title, content, tags)
+    VALUES (new.id, new.title, new.content, new.tags);
+END;
+
+-- Index existing notes, once. run-migration.ts re-runs every file, and the
+-- triggers keep the index current after this, so only an index that is
+-- still empty gets rebuilt. The check reads the _docsize shadow table
+-- because SELECTs on raw_notes_fts itself read the raw_notes content.
+INSERT INTO raw_notes_fts (raw_notes_fts)
+SELECT 'rebuild'
+WHERE NOT EXISTS (SELECT 1 FROM raw_notes_fts_docsize);
@@ -0,0 +1,48 @@
+-- 024_note_concepts.sql
+-- Normalized concept -> note index built from processed_notes.concepts.
+-- Lets "all notes about X", concept counts and Obsidian concept hub pages
+-- come from one indexed query instead of json-parsing every processed note.
+-- Triggers keep it in sync; scripts/backfill-note-concepts.py rebuilds it.
+
+CREATE TABLE IF NOT EXISTS note_concepts (
+    concept TEXT NOT NULL,
+    raw_note_id INTEGER NOT NULL,
+    processed_note_id INTEGER NOT NULL,
+    PRIMARY KEY (concept, raw_note_id),
+    FOREIGN KEY (raw_note_id) REFERENCES raw_notes(id) ON DELETE CASCADE,
+    FOREIGN KEY (processed_note_id) REFERENCES processed_notes(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_note_concepts_note ON note_concepts(raw_note_id);
+CREATE INDEX IF NOT EXISTS idx_note_concepts_processed ON note_concepts(processed_note_id);
+
+CREATE TRIGGER IF NOT EXISTS note_concepts_insert AFTER INSERT ON processed_notes
+WHEN json_valid(new.concepts)
+BEGIN
+    INSERT OR IGNORE INTO note_concepts (concept, raw_note_id, processed_note_id)
+    SELECT DISTINCT value, new.raw_note_id, new.id
+    FROM json_each(new.concepts)
+    WHERE type = 'text' AND value != '';
+END;
+
+CREATE TRIGGER IF NOT EXISTS note_concepts_update AFTER UPDATE OF concepts, raw_note_id ON processed_notes
+BEGIN
+    DELETE FROM note_concepts WHERE processed_note_id = old.id;
+    INSERT OR IGNORE INTO note_concepts (concept, raw_note_id, processed_note_id)
+    SELECT DISTINCT value, new.raw_note_id, new.id
+    FROM json_each(CASE WHEN json_valid(new.concepts) THEN new.concepts ELSE '[]' END)
+    WHERE type = 'text' AND value != '';
+END;
+
+CREATE TRIGGER IF NOT EXISTS note_concepts_delete AFTER DELETE ON processed_notes
+BEGIN
+    DELETE FROM note_concepts WHERE processed_note_id = old.id;
+END;
+
+-- Backfill existing notes
+INSERT OR IGNORE INTO note_concepts (concept, raw_note_id, processed_note_id)
+SELECT DISTINCT je.value, pn.raw_note_id, pn.id
+FROM processed_notes pn,
+    json_each(CASE WHEN json_valid(pn.concepts) THEN pn.concepts ELSE '[]' END) je
+WHERE je.type = 'text'
+    AND je.value != '';
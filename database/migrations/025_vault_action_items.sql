@@ -0,0 +1,33 @@
+-- 025_vault_action_items.sql
+-- Read-back of action items checked off in Obsidian.
+-- scripts/obsidian_export.py records every file it writes in a manifest
+-- (mtime/size at write time plus which action items were checked), and
+-- `obsidian_export.py --sync-actions` re-reads only files whose mtime or size
+-- moved since, applying completions to note_action_items.
+
+-- Export manifest: one row per vault file written by the exporter
+CREATE TABLE IF NOT EXISTS obsidian_export_files (
+    path TEXT PRIMARY KEY,
+    target TEXT NOT NULL,  -- Vault target name (see obsidian_exports)
+    raw_note_id INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    checked_items TEXT NOT NULL DEFAULT '[]',  -- JSON array of items ticked in this file at last write/scan
+    recorded_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (raw_note_id) REFERENCES raw_notes(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_export_files_note ON obsidian_export_files(raw_note_id);
+
+-- Action items extracted into exported notes, with completion state
+CREATE TABLE IF NOT EXISTS note_action_items (
+    raw_note_id INTEGER NOT NULL,
+    item_text TEXT NOT NULL,
+    completed_at TEXT,  -- NULL = open
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (raw_note_id, item_text),
+    FOREIGN KEY (raw_note_id) REFERENCES raw_notes(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_note_action_items_open ON note_action_items(raw_note_id)
+    WHERE completed_at IS NULL;
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Rebuild the note_concepts index from processed_notes.concepts.
+
+Migration 024_note_concepts.sql creates the table, its sync triggers and an
+initial backfill. Run this after restoring a backup, bulk-editing concepts
+with triggers disabled, or whenever `--check` reports drift.
+
+Usage:
+    python3 scripts/backfill-note-concepts.py            # rebuild
+    python3 scripts/backfill-note-concepts.py --check    # report drift only
+    python3 scripts/backfill-note-concepts.py --db ~/selene-data-dev/selene.db
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+
+def expected_rows(conn):
+    """(concept, raw_note_id, processed_note_id) rows implied by processed_notes."""
+    rows = set()
+    skipped = 0
+    for processed_id, raw_note_id, concepts in conn.execute(
+        "SELECT id, raw_note_id, concepts FROM processed_notes WHERE concepts IS NOT NULL"
+    ):
+        try:
+            parsed = json.loads(concepts)
+        except (json.JSONDecodeError, TypeError):
+            skipped += 1
+            continue
+        if not isinstance(parsed, list):
+            continue
+        for concept in parsed:
+            if isinstance(concept, str) and concept:
+                rows.add((concept, raw_note_id, processed_id))
+    return rows, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the note_concepts index")
+    parser.add_argument("--db", default=os.environ.get("SELENE_DB_PATH", "/selene/data/selene.db"))
+    parser.add_argument("--check", action="store_true", help="Only report differences, don't write")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(os.path.expanduser(args.db))
+    exists = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'note_concepts'"
+    ).fetchone()[0]
+    if not exists:
+        sys.exit("note_concepts table missing - run database/migrations/024_note_concepts.sql first")
+
+    wanted, skipped = expected_rows(conn)
+    # (concept, raw_note_id) is the key; keep one processed row per pair like INSERT OR IGNORE
+    wanted_by_key = {}
+    for concept, raw_note_id, processed_id in sorted(wanted):
+        wanted_by_key.setdefault((concept, raw_note_id), processed_id)
+
+    current = set(conn.execute("SELECT concept, raw_note_id FROM note_concepts").fetchall())
+    missing = set(wanted_by_key) - current
+    stale = current - set(wanted_by_key)
+
+    print(f"processed_notes with unparseable concepts: {skipped}")
+    print(f"note_concepts rows: {len(current)} (expected {len(wanted_by_key)})")
+    print(f"missing: {len(missing)}, stale: {len(stale)}")
+
+    if args.check:
+        sys.exit(1 if missing or stale else 0)
+
+    with conn:
+        conn.execute("DELETE FROM note_concepts")
+        conn.executemany(
+            "INSERT INTO note_concepts (concept, raw_note_id, processed_note_id) VALUES (?, ?, ?)",
+            [(concept, raw_note_id, processed_id) for (concept, raw_note_id), processed_id in wanted_by_key.items()],
+        )
+
+    print(f"Rebuilt note_concepts: {len(wanted_by_key)} rows")
+    print("\nTop concepts:")
+    for concept, count in conn.execute(
+        "SELECT concept, COUNT(*) FROM note_concepts GROUP BY concept ORDER BY COUNT(*) DESC LIMIT 15"
+    ):
+        print(f"  {concept}: {count}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
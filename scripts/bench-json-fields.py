@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-note JSON handling in the Obsidian export path.
+
+"before" is the original path: select the raw sentiment_data blob and decode
+all four JSON columns with the stdlib. "after" is what obsidian_export.py does
+now: SQLite validates the blob once and pulls the fields the renderer needs
+into one small JSON array (SENTIMENT_COLUMNS), and only that array and the
+other small columns are decoded - with the stdlib ("after_stdlib") or with
+orjson when it is installed ("after").
+
+Query and decode time are reported separately, in microseconds per note,
+since moving work into SQL shifts cost from one to the other.
+
+Usage:
+    python3 scripts/bench-json-fields.py                  # synthetic notes
+    python3 scripts/bench-json-fields.py --notes 20000
+    python3 scripts/bench-json-fields.py --db ~/selene-data-dev/selene.db
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import obsidian_export  # noqa: E402
+from dev_db import EMOTIONS, THEMES  # noqa: E402
+
+BEFORE_SQL = """
+SELECT rn.tags, pn.concepts, pn.secondary_themes, pn.sentiment_data
+FROM raw_notes rn
+JOIN processed_notes pn ON rn.id = pn.raw_note_id
+"""
+
+AFTER_SQL = f"""
+SELECT rn.tags, pn.concepts, pn.secondary_themes, {obsidian_export.SENTIMENT_COLUMNS}
+FROM raw_notes rn
+JOIN processed_notes pn ON rn.id = pn.raw_note_id
+"""
+
+
+def create_synthetic_db(path, count, seed=42):
+    """Notes with sentiment_data shaped like the LLM output (incl. fields the export ignores)"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+    CREATE TABLE raw_notes (id INTEGER PRIMARY KEY, tags TEXT);
+    CREATE TABLE processed_notes (id INTEGER PRIMARY KEY, raw_note_id INTEGER,
+        concepts TEXT, secondary_themes TEXT, sentiment_data TEXT);
+    """)
+    for note_id in range(1, count + 1):
+        conn.execute("INSERT INTO raw_notes VALUES (?, ?)",
+                     (note_id, json.dumps([f"#{t}" for t in rng.sample(THEMES, 2)])))
+        conn.execute("INSERT INTO processed_notes VALUES (?, ?, ?, ?, ?)", (
+            note_id, note_id,
+            json.dumps(rng.sample(THEMES, rng.randint(1, 4)) + ["ceramic glazing", "sprint planning"][:rng.randint(0, 2)]),
+            json.dumps(rng.sample(THEMES, 1)),
+            json.dumps({
+                "overall_sentiment": rng.choice(["positive", "negative", "neutral", "mixed"]),
+                "sentiment_score": round(rng.random(), 2),
+                "emotional_tone": rng.choice(["calm", "anxious", "excited"]),
+                "energy_level": rng.choice(["high", "medium", "low"]),
+                "key_emotions": rng.sample(EMOTIONS, rng.randint(0, 3)),
+                "stress_indicators": rng.random() < 0.2,
+                "adhd_markers": {"overwhelm": rng.random() < 0.2, "hyperfocus": rng.random() < 0.1,
+                                 "executive_dysfunction": rng.random() < 0.1, "time_blindness": False},
+                "analysis_confidence": round(rng.uniform(0.5, 0.95), 2),
+                "reasoning": "The note describes " + " ".join(rng.choice(EMOTIONS) for _ in range(30)) + ".",
+            }),
+        ))
+    conn.commit()
+    conn.close()
+
+
+def parse_field(loads, field, default=None):
+    """parse_json_field with a chosen decoder"""
+    if not field:
+        return default if default is not None else []
+    try:
+        return loads(field)
+    except (ValueError, TypeError):
+        return default if default is not None else []
+
+
+def decode_before(rows):
+    for tags, concepts, secondary_themes, sentiment_data in rows:
+        parse_field(json.loads, concepts)
+        parse_field(json.loads, secondary_themes)
+        parse_field(json.loads, tags)
+        data = parse_field(json.loads, sentiment_data, {'adhd_markers': {}, 'key_emotions': [], 'stress_indicators': False})
+        markers = data.get('adhd_markers', {})
+        (markers.get('overwhelm'), markers.get('hyperfocus'), markers.get('executive_dysfunction'),
+         data.get('key_emotions', []), data.get('stress_indicators', False), data.get('analysis_confidence', 0.5))
+
+
+def decode_after(rows, loads):
+    for row in rows:
+        parse_field(loads, row['concepts'])
+        parse_field(loads, row['secondary_themes'])
+        parse_field(loads, row['tags'])
+        obsidian_export.note_sentiment(row, loads)
+
+
+def timed(fn, repeat):
+    """Best of `repeat` runs, in seconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-note JSON cost of the Obsidian export")
+    parser.add_argument("--db", help="Benchmark against this database (default: synthetic)")
+    parser.add_argument("--notes", type=int, default=5000, help="Synthetic notes to generate")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmpdir = None
+    db_path = args.db and os.path.expanduser(args.db)
+    if not db_path:
+        tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmpdir.name, "bench.db")
+        create_synthetic_db(db_path, args.notes)
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+
+    before_query, before_rows = timed(lambda: conn.execute(BEFORE_SQL).fetchall(), args.repeat)
+    before_decode, _ = timed(lambda: decode_before(before_rows), args.repeat)
+    after_query, after_rows = timed(lambda: conn.execute(AFTER_SQL).fetchall(), args.repeat)
+    # sqlite3.Row behaves like the dicts the exporter builds for note_sentiment()
+    after_decode_stdlib, _ = timed(lambda: decode_after(after_rows, json.loads), args.repeat)
+    after_decode_fast, _ = timed(lambda: decode_after(after_rows, obsidian_export.json_loads), args.repeat)
+    conn.close()
+
+    count = len(before_rows)
+    if not count:
+        sys.exit("No notes to benchmark")
+
+    def per_note(seconds):
+        return round(seconds / count * 1e6, 2)
+
+    print(json.dumps({
+        "notes": count,
+        "decoder": obsidian_export.JSON_DECODER,
+        "us_per_note": {
+            "before": {"query": per_note(before_query), "decode": per_note(before_decode),
+                       "total": per_note(before_query + before_decode)},
+            "after_stdlib": {"query": per_note(after_query), "decode": per_note(after_decode_stdlib),
+                             "total": per_note(after_query + after_decode_stdlib)},
+            "after": {"query": per_note(after_query), "decode": per_note(after_decode_fast),
+                      "total": per_note(after_query + after_decode_fast)},
+        },
+    }, indent=2))
+
+    if tmpdir:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Scratch databases for the dev and benchmark scripts.
+
+Shared by scripts/replay-arrivals.py, scripts/export-parity.py and
+scripts/bench-json-fields.py: build a database from database/schema.sql plus
+every migration, and insert notes that are already processed, with seeded
+stand-ins for the LLM and sentiment fields, so the export path can run
+without Ollama.
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Value pools for the stand-in analysis fields
+THEMES = ["work", "mise", "ceramics", "learning", "adhd", "health", "travel", "home", "social"]
+TONES = ["calm", "excited", "anxious", "frustrated", "content", "overwhelmed", "motivated", "focused"]
+SENTIMENTS = ["positive", "negative", "neutral", "mixed"]
+ENERGY_LEVELS = ["high", "medium", "low"]
+EMOTIONS = ["joy", "worry", "relief", "pride", "frustration", "curiosity", "calm", "dread"]
+
+
+def init_db(db_path, environment="test"):
+    """Create a scratch database from schema.sql plus every migration
+
+    Args:
+        db_path: Where to create it
+        environment: Marker stored in _selene_metadata. The TS side needs
+            'development': config.ts loads .env.development (which sets
+            SELENE_ENV=development) and db.ts then checks the marker.
+    """
+    conn = sqlite3.connect(db_path)
+    with open(os.path.join(PROJECT_ROOT, "database", "schema.sql")) as f:
+        conn.executescript(f.read())
+
+    # Same as scripts/run-migration.ts: run each file whole, skip what already exists
+    for migration in sorted(glob.glob(os.path.join(PROJECT_ROOT, "database", "migrations", "*.sql"))):
+        with open(migration) as f:
+            try:
+                conn.executescript(f.read())
+            except sqlite3.OperationalError as e:
+                if "already exists" not in str(e) and "duplicate column" not in str(e):
+                    print(f"  {os.path.basename(migration)}: {e}", file=sys.stderr)
+
+    conn.execute(
+        "INSERT OR REPLACE INTO _selene_metadata (key, value) VALUES ('environment', ?)", (environment,)
+    )
+    conn.commit()
+    conn.close()
+
+
+def insert_processed_note(conn, note, content_hash, source_type, test_run, analysis):
+    """Insert a raw note and its processed_notes row, ready for export
+
+    Does not commit.
+
+    Args:
+        note: Dict with title, content, tags (list) and created_at
+        content_hash: raw_notes.content_hash (must be unique)
+        analysis: processed_notes fields - concepts, primary_theme,
+            secondary_themes (lists), sentiment_data (dict),
+            overall_sentiment, sentiment_score, emotional_tone, energy_level
+
+    Returns:
+        The new raw_notes id
+    """
+    content = note["content"]
+    cur = conn.execute(
+        """INSERT INTO raw_notes
+           (title, content, content_hash, source_type, word_count, character_count,
+            tags, created_at, status, test_run)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'processed', ?)""",
+        (note["title"], content, content_hash, source_type, len(content.split()), len(content),
+         json.dumps(note["tags"]), note["created_at"], test_run),
+    )
+    conn.execute(
+        """INSERT INTO processed_notes
+           (raw_note_id, concepts, primary_theme, secondary_themes, sentiment_analyzed,
+            sentiment_data, overall_sentiment, sentiment_score, emotional_tone, energy_level)
+           VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?)""",
+        (cur.lastrowid, json.dumps(analysis["concepts"]), analysis["primary_theme"],
+         json.dumps(analysis["secondary_themes"]), json.dumps(analysis["sentiment_data"]),
+         analysis["overall_sentiment"], analysis["sentiment_score"],
+         analysis["emotional_tone"], analysis["energy_level"]),
+    )
+    return cur.lastrowid
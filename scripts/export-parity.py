@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Parity and throughput check between the two Obsidian exporters.
+
+Seeds one database, copies it, and runs scripts/obsidian_export.py and
+src/workflows/export-obsidian.ts against their own copy and vault. It then
+diffs the rendered Timeline markdown note by note and reports wall time,
+notes/second and peak RSS for each side.
+
+The seed is fixtures/dev-seed-notes.json (run scripts/generate-dev-fixture.py
+first) plus a handful of edge cases that have drifted before: tones only one
+emoji map knows (reflective, curious), missing energy/tone, quotes in
+titles, checkbox content and timestamps near month boundaries.
+
+Usage:
+    python3 scripts/export-parity.py
+    python3 scripts/export-parity.py --limit 100 --show-diffs 3
+    python3 scripts/export-parity.py --ts-command "node dist/workflows/export-obsidian.js"
+    python3 scripts/export-parity.py --only python --report /tmp/parity.json
+
+The TS exporter exports 50 notes per call, so it is re-run until nothing is
+left; its numbers include one process start (ts-node compile) per call.
+"""
+
+import argparse
+import difflib
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import shlex
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from dev_db import (  # noqa: E402
+    EMOTIONS, ENERGY_LEVELS, PROJECT_ROOT, SENTIMENTS, THEMES, TONES, init_db, insert_processed_note,
+)
+
+PY_EXPORTER = os.path.join(SCRIPT_DIR, "obsidian_export.py")
+TS_COMMAND = "npx ts-node src/workflows/export-obsidian.ts"
+
+EDGE_CASES = [
+    {"title": "Reflective evening", "content": "Sat with the week for a while. Not much to do, just noticing.",
+     "tags": ["#reflection"], "created_at": "2026-01-31T23:45:00-08:00", "emotional_tone": "reflective"},
+    {"title": "Curious about glazes", "content": "Why does celadon go green in reduction? Need to read about iron oxide.",
+     "tags": ["#ceramics"], "created_at": "2026-02-01T00:15:00Z", "emotional_tone": "curious"},
+    {"title": 'The "quick" fix', "content": "Said it would take five minutes. It did not take five minutes.",
+     "tags": ["#work"], "created_at": "2025-12-31T23:59:00Z"},
+    {"title": "Unprocessed fields", "content": "Captured on the bus, no analysis yet beyond the basics.",
+     "tags": [], "created_at": "2026-01-15T12:00:00Z", "energy_level": None, "emotional_tone": None},
+    {"title": "Checklist dump", "content": "- [ ] renew passport\n- [x] call the landlord\n- TODO: book kiln time\nI should stretch more.",
+     "tags": ["#personal"], "created_at": "2026-01-10T09:30:00Z"},
+]
+
+# Lines whose value depends on when the export ran, not on the note
+VOLATILE_LINES = [
+    (re.compile(r"^- \*\*Processed\*\*: .*$", re.M), "- **Processed**: <date>"),
+]
+
+
+# --- Seeding ---
+
+def seed_notes(db_path, notes, seed):
+    """Insert notes as processed and sentiment-analysed, ready for either exporter"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    for seq, note in enumerate(notes):
+        concepts = [tag.lstrip("#") for tag in note["tags"]] + rng.sample(THEMES, rng.randint(0, 2))
+        tone = note["emotional_tone"] if "emotional_tone" in note else rng.choice(TONES)
+        energy = note["energy_level"] if "energy_level" in note else rng.choice(ENERGY_LEVELS)
+        insert_processed_note(
+            conn, note, hashlib.sha256(f"{seq}:{note['content']}".encode()).hexdigest(), "parity", "export-parity",
+            {
+                "concepts": concepts,
+                "primary_theme": rng.choice(THEMES),
+                "secondary_themes": rng.sample(THEMES, 1),
+                "sentiment_data": {
+                    "adhd_markers": {"overwhelm": rng.random() < 0.2, "hyperfocus": rng.random() < 0.1},
+                    "key_emotions": rng.sample(EMOTIONS, rng.randint(0, 2)),
+                    "stress_indicators": rng.random() < 0.2,
+                    "analysis_confidence": round(rng.uniform(0.5, 0.95), 2),
+                },
+                "overall_sentiment": rng.choice(SENTIMENTS),
+                "sentiment_score": round(rng.random(), 2),
+                "emotional_tone": tone,
+                "energy_level": energy,
+            },
+        )
+    conn.commit()
+    conn.close()
+
+
+def exported_count(db_path):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM raw_notes WHERE exported_to_obsidian = 1").fetchone()[0]
+    conn.close()
+    return count
+
+
+# --- Running the exporters ---
+
+def run_measured(command, env, log_path):
+    """Run a command to completion; return (seconds, peak RSS bytes, exit code)"""
+    with open(log_path, "ab") as log:
+        started = time.perf_counter()
+        proc = subprocess.Popen(command, cwd=PROJECT_ROOT, env=env, stdout=log, stderr=log)
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - started
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    peak = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return elapsed, peak, proc.returncode
+
+
+def run_exporter(name, command, db_path, vault_path, workdir, repeat_until_done):
+    env = dict(os.environ, SELENE_DB_PATH=db_path, OBSIDIAN_VAULT_PATH=vault_path)
+    env.pop("OBSIDIAN_VAULT_TARGETS", None)
+    log_path = os.path.join(workdir, f"{name}.log")
+
+    calls = 0
+    seconds = 0.0
+    peak = 0
+    failed = False
+    while True:
+        before = exported_count(db_path)
+        elapsed, rss, code = run_measured(command, env, log_path)
+        calls += 1
+        seconds += elapsed
+        peak = max(peak, rss)
+        after = exported_count(db_path)
+        if code != 0:
+            failed = True
+            with open(log_path, errors="replace") as log:
+                tail = log.read().splitlines()[-10:]
+            print(f"{name} exporter exited with {code}:\n  " + "\n  ".join(tail), file=sys.stderr)
+            break
+        if not repeat_until_done or after == before:
+            break
+
+    exported = exported_count(db_path)
+    return {
+        "command": " ".join(command),
+        "calls": calls,
+        "exit_ok": not failed,
+        "exported": exported,
+        "seconds": round(seconds, 3),
+        "notes_per_second": round(exported / seconds, 1) if seconds else None,
+        "peak_rss_mb": round(peak / (1024 * 1024), 1),
+        "log": log_path,
+    }
+
+
+# --- Comparing output ---
+
+def timeline_notes(vault_path):
+    """{filename: markdown} for every note under Selene/Timeline
+
+    Keyed by filename rather than path: the two exporters may file the same
+    note under different year/month folders (local vs UTC dates), which shows
+    up as a missing/extra note if the filenames differ too.
+    """
+    notes = {}
+    for path in glob.glob(os.path.join(vault_path, "Selene", "Timeline", "*", "*", "*.md")):
+        with open(path, encoding="utf-8") as f:
+            notes[os.path.basename(path)] = f.read()
+    return notes
+
+
+def normalize(markdown):
+    for pattern, replacement in VOLATILE_LINES:
+        markdown = pattern.sub(replacement, markdown)
+    return markdown
+
+
+def compare_vaults(py_vault, ts_vault):
+    py_notes = timeline_notes(py_vault)
+    ts_notes = timeline_notes(ts_vault)
+    common = sorted(set(py_notes) & set(ts_notes))
+
+    identical = 0
+    differing = []
+    line_counts = Counter()
+    for filename in common:
+        py_lines = normalize(py_notes[filename]).splitlines()
+        ts_lines = normalize(ts_notes[filename]).splitlines()
+        if py_lines == ts_lines:
+            identical += 1
+            continue
+        diff = list(difflib.unified_diff(py_lines, ts_lines, "python/" + filename, "ts/" + filename, n=1, lineterm=""))
+        changed = [line for line in diff[2:] if line[:1] in "+-"]
+        line_counts.update(changed)
+        differing.append({"note": filename, "changed_lines": len(changed), "diff": diff})
+
+    return {
+        "python_notes": len(py_notes),
+        "ts_notes": len(ts_notes),
+        "compared": len(common),
+        "identical": identical,
+        "different": len(differing),
+        "only_python": sorted(set(py_notes) - set(ts_notes)),
+        "only_ts": sorted(set(ts_notes) - set(py_notes)),
+        # Most frequent changed lines ('-' python, '+' ts) point at systematic drift
+        "top_divergent_lines": [{"line": line, "notes": count} for line, count in line_counts.most_common(25)],
+        "diffs": differing,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare obsidian_export.py with export-obsidian.ts")
+    parser.add_argument("--fixture", default=os.path.join(PROJECT_ROOT, "fixtures", "dev-seed-notes.json"))
+    parser.add_argument("--limit", type=int, help="Seed at most this many fixture notes")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated analysis fields")
+    parser.add_argument("--ts-command", default=TS_COMMAND, help=f"How to run the TS exporter (default: {TS_COMMAND})")
+    parser.add_argument("--only", choices=["python", "ts"], help="Run one side only (throughput, no diff)")
+    parser.add_argument("--show-diffs", type=int, default=5, help="Print this many per-note diffs")
+    parser.add_argument("--workdir", help="Keep databases, vaults and logs here (default: temp dir, removed)")
+    parser.add_argument("--report", help="Also write the full JSON report (every diff) here")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.fixture):
+        sys.exit(f"Fixture not found: {args.fixture} (run scripts/generate-dev-fixture.py)")
+    with open(args.fixture) as f:
+        notes = json.load(f)
+    if args.limit:
+        notes = notes[:args.limit]
+    notes = notes + EDGE_CASES
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="selene-parity-")
+    os.makedirs(workdir, exist_ok=True)
+    seed_db = os.path.join(workdir, "seed.db")
+    if os.path.exists(seed_db):
+        os.remove(seed_db)
+    # Marked 'development' so the TS exporter's db.ts accepts it
+    init_db(seed_db, environment="development")
+    seed_notes(seed_db, notes, args.seed)
+    print(f"Seeded {len(notes)} notes in {workdir}", file=sys.stderr)
+
+    sides = {
+        "python": ([sys.executable, PY_EXPORTER, "--drain"], False),
+        "ts": (shlex.split(args.ts_command), True),
+    }
+    results = {}
+    vaults = {}
+    for name, (command, repeat) in sides.items():
+        if args.only and name != args.only:
+            continue
+        db_path = os.path.join(workdir, f"{name}.db")
+        vaults[name] = os.path.join(workdir, f"vault-{name}")
+        shutil.copyfile(seed_db, db_path)
+        shutil.rmtree(vaults[name], ignore_errors=True)
+        print(f"Running {name} exporter...", file=sys.stderr)
+        results[name] = run_exporter(name, command, db_path, vaults[name], workdir, repeat)
+
+    if not args.workdir:
+        # The temp dir (logs included) is removed on exit
+        for result in results.values():
+            result.pop("log")
+    report = {"seeded": len(notes), "workdir": args.workdir, "throughput": results}
+    if len(vaults) == 2:
+        report["parity"] = compare_vaults(vaults["python"], vaults["ts"])
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    # Diffs are printed as text below the JSON summary
+    diffs = report.get("parity", {}).pop("diffs", [])
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    for entry in diffs[:args.show_diffs]:
+        print(f"\n# {entry['note']} ({entry['changed_lines']} changed lines)")
+        print("\n".join(entry["diff"]))
+
+    if not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    failed = any(not result["exit_ok"] for result in results.values())
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,32 @@ Domains: work (Mise recipe app), learning (ceramics), health (ADHD), personal, r
 Span: Nov 15 2025 - Feb 15 2026, Pacific Time.
 
 Usage: python3 scripts/generate-dev-fixture.py
+       python3 scripts/generate-dev-fixture.py --count 1000000
+       python3 scripts/generate-dev-fixture.py --count 50000 --length-mix capture=0.3,standard=0.5,voice-memo=0.2
 Output: fixtures/dev-seed-notes.json
+        fixtures/dev-arrival-schedule.json (replay with scripts/replay-arrivals.py)
+
+The default run picks whole notes from the template pools below. With
+--count (or --synthesize) notes are instead recombined from the pools'
+sentences per domain, sized by a length mix (quick captures through long
+voice-memo transcripts), every note's content is unique, and titles are
+drawn from the note's own sentences, so large fixtures collapse neither onto
+a few hundred content hashes nor onto shared vault filenames.
 """
 
+import argparse
+import hashlib
 import json
+import math
 import random
 import os
+import re
+import sys
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from obsidian_export import create_slug  # noqa: E402
+
 random.seed(42)  # Reproducible
 
 # --- Content pools organized by domain and thread ---
@@ -201,8 +219,33 @@ RANDOM_CAPTURES = [
 
 # --- Timestamp Generation ---
 
-def gen_timestamps(start_date, end_date, target_count):
-    """Generate realistic timestamps with ADHD-like patterns."""
+def is_burst_day(day_offset):
+    return (day_offset % 11 == 3) or (day_offset % 13 == 7)
+
+
+def is_recovery_day(day_offset):
+    return (day_offset % 11 == 4) or (day_offset % 13 == 8)
+
+
+def day_kind(day_offset):
+    """Classify a day for replay reports: burst, recovery, or normal.
+
+    A day can hit both cycles; its rate ends up below normal, so it
+    counts as recovery.
+    """
+    if is_recovery_day(day_offset):
+        return "recovery"
+    if is_burst_day(day_offset):
+        return "burst"
+    return "normal"
+
+
+def gen_timestamps(start_date, end_date, target_count, daily_scale=1.0):
+    """Generate realistic timestamps with ADHD-like patterns.
+
+    daily_scale multiplies the per-day rate (and its cap) so large fixtures
+    keep the same daily shape over the same span.
+    """
     timestamps = []
     current = start_date
 
@@ -221,17 +264,17 @@ def gen_timestamps(start_date, end_date, target_count):
 
         # Burst days (roughly every 10 days)
         day_offset = (current - start_date).days
-        is_burst = (day_offset % 11 == 3) or (day_offset % 13 == 7)
+        is_burst = is_burst_day(day_offset)
         if is_burst:
             base_rate *= 1.8
 
         # Post-burst recovery
-        is_recovery = (day_offset % 11 == 4) or (day_offset % 13 == 8)
+        is_recovery = is_recovery_day(day_offset)
         if is_recovery:
             base_rate *= 0.3
 
-        count = max(0, int(random.gauss(base_rate, 1.5)))
-        count = min(count, 10)
+        count = max(0, int(random.gauss(base_rate * daily_scale, 1.5 * daily_scale)))
+        count = min(count, int(10 * daily_scale))
 
         for _ in range(count):
             if is_weekday:
@@ -268,27 +311,376 @@ def gen_timestamps(start_date, end_date, target_count):
     return timestamps
 
 
-def pick_note(timestamps_idx, total, pools_with_weights):
-    """Pick a note from weighted pools based on position in timeline."""
+def gen_arrival_schedule(timestamps, start_date):
+    """Turn capture timestamps into an arrival schedule for load replay.
+
+    Each entry points at the note with the same index in the fixture and
+    carries its offset from the first capture, so scripts/replay-arrivals.py
+    can re-create the capture bursts at real or accelerated speed.
+    """
+    if not timestamps:
+        return []
+    first = timestamps[0]
+    schedule = []
+    for i, ts in enumerate(timestamps):
+        schedule.append({
+            "index": i,
+            "created_at": format_timestamp(ts),
+            "offset_seconds": int((ts - first).total_seconds()),
+            "day_kind": day_kind((ts.date() - start_date.date()).days),
+        })
+    return schedule
+
+
+def pick_pool(pools_with_weights):
+    """Pick one pool by weight."""
     r = random.random()
     cumulative = 0
     for pool, weight in pools_with_weights:
         cumulative += weight
         if r < cumulative:
-            return random.choice(pool)
-    return random.choice(pools_with_weights[-1][0])
+            return pool
+    return pools_with_weights[-1][0]
+
+
+def pick_note(timestamps_idx, total, pools_with_weights):
+    """Pick a note from weighted pools based on position in timeline."""
+    return random.choice(pick_pool(pools_with_weights))
 
 
 def format_timestamp(dt):
     return dt.strftime("%Y-%m-%dT%H:%M:%S-08:00")
 
 
+def context_weights(pools, ts):
+    """Reweight pools for the time of day / week / season, normalized to 1."""
+    month = ts.month
+    day_of_week = ts.weekday()
+    hour = ts.hour
+
+    adjusted_pools = []
+    for pool, weight in pools:
+        w = weight
+        # More work during weekday work hours
+        if pool in (WORK_MISE, WORK_JOB) and day_of_week < 5 and 9 <= hour <= 17:
+            w *= 1.5
+        # Less work on weekends
+        if pool in (WORK_MISE, WORK_JOB) and day_of_week >= 5:
+            w *= 0.3
+        # More ceramics on Saturday mornings
+        if pool == CERAMICS and day_of_week == 5 and hour < 13:
+            w *= 2.0
+        # More sleep notes late at night
+        if pool == HEALTH_SLEEP and (hour >= 22 or hour <= 5):
+            w *= 2.0
+        # More Joshua Tree notes closer to Feb
+        if pool == PERSONAL_JOSHUA_TREE and month >= 1:
+            w *= 1.5
+        # More exercise notes morning/evening
+        if pool == HEALTH_EXERCISE and (6 <= hour <= 9 or 17 <= hour <= 20):
+            w *= 1.5
+        adjusted_pools.append((pool, w))
+
+    # Normalize
+    total_w = sum(w for _, w in adjusted_pools)
+    return [(p, w/total_w) for p, w in adjusted_pools]
+
+
+# --- Content synthesis ---
+
+DEFAULT_TARGET = 560
+
+# Prefixes for repeated templates; synthesized notes open with one sometimes
+PREFIXES = [
+    "Update: ", "Thinking more about this - ", "Following up: ",
+    "Quick note - ", "Revisiting this thought: ", "Adding to earlier note - ",
+    "More on this: ", "New development - ", "Realized something: ",
+    "Late night thought: ", "Morning reflection: ", "Post-coffee clarity: ",
+]
+
+# Target content length in characters: (median, lognormal sigma, min, max).
+# Captures are one-liners, voice memos are dictated transcripts that ramble
+# across several thousand characters without paragraph breaks.
+LENGTH_PROFILES = {
+    "capture": (90, 0.5, 25, 280),
+    "standard": (420, 0.45, 150, 1500),
+    "long": (1400, 0.35, 700, 4000),
+    "voice-memo": (3500, 0.6, 1500, 20000),
+}
+
+DEFAULT_LENGTH_MIX = {"capture": 0.2, "standard": 0.6, "long": 0.12, "voice-memo": 0.08}
+
+VOICE_FILLERS = [
+    "Okay so", "Um,", "So yeah,", "Anyway,", "And, uh,", "Where was I.",
+    "Right.", "Let me think.", "Actually wait,", "I don't know,", "Like,",
+    "The thing is,", "Oh and", "Hmm.", "Which, honestly,",
+]
+
+VOICE_TANGENTS = [
+    "Totally unrelated but", "Oh that reminds me,", "Side note,",
+    "Random thought,", "Before I forget,",
+]
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])(?<!Dr\.)(?<!Mr\.)(?<!Ms\.)(?<!vs\.)\s+(?=[A-Z0-9'\"(])")
+NUMBER = re.compile(r"\b\d+\b")
+
+NUMBER_JITTER_RATE = 0.3
+TANGENT_RATE = 0.12
+FILLER_RATE = 0.35
+PREFIX_RATE = 0.1
+
+# Synthesized titles: a body sentence's opening words, on their own or as a
+# subtitle to the template's title. create_slug() keeps 50 characters of it.
+TITLE_WORDS = (3, 7)
+SUBTITLE_RATE = 0.5
+TITLE_RETRIES = 8
+TITLE_PUNCTUATION = ".,;:!?-\"'()"
+# Words a headline shouldn't stop on ("Need to talk to")
+TITLE_DANGLING = frozenset("""
+a an and as at but by for from i if in is it my of on or so than that the
+then to up was with
+""".split())
+
+
+def split_fragments(pool):
+    """Sentences from every note in a pool, each with its note's tags."""
+    fragments = []
+    for note in pool:
+        for sentence in SENTENCE_SPLIT.split(note["content"]):
+            fragments.append((sentence.strip(), note["tags"]))
+    return fragments
+
+
+def parse_length_mix(spec):
+    """Parse 'capture=0.2,voice-memo=0.1' into normalized profile weights."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in LENGTH_PROFILES:
+            raise ValueError(f"Unknown length profile: {name} (choose from {', '.join(LENGTH_PROFILES)})")
+        mix[name] = float(weight)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Length mix weights must sum to more than 0")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def pick_profile(length_mix):
+    r = random.random()
+    cumulative = 0
+    for name, weight in length_mix.items():
+        cumulative += weight
+        if r < cumulative:
+            return name
+    return name
+
+
+def target_length(profile):
+    median, sigma, low, high = LENGTH_PROFILES[profile]
+    return min(high, max(low, int(random.lognormvariate(math.log(median), sigma))))
+
+
+def jitter_numbers(sentence):
+    """Swap the numbers in a sentence for nearby ones (3 miles -> 5 miles)."""
+    if random.random() >= NUMBER_JITTER_RATE:
+        return sentence
+
+    def swap(match):
+        n = int(match.group())
+        # Leave 0/1 alone so "1 cup" doesn't turn into "0 cups"
+        return match.group() if n < 2 else str(random.randint(max(2, n // 2), n * 2))
+
+    return NUMBER.sub(swap, sentence)
+
+
+def lower_first(text):
+    return text[0].lower() + text[1:] if text else text
+
+
+def next_sentence(fragments, all_fragments, voice, max_length):
+    """One sentence for the note, as (text, tags).
+
+    Tries a few fragments for one that fits under max_length and falls back
+    to the shortest candidate. Voice memos wander into other domains and get
+    spoken fillers.
+    """
+    source = fragments
+    lead = None
+    if voice and random.random() < TANGENT_RATE:
+        source = all_fragments
+        lead = random.choice(VOICE_TANGENTS)
+    elif voice and random.random() < FILLER_RATE:
+        lead = random.choice(VOICE_FILLERS)
+
+    candidates = [random.choice(source) for _ in range(4)]
+    fitting = [c for c in candidates if len(c[0]) <= max_length]
+    sentence, tags = fitting[0] if fitting else min(candidates, key=lambda c: len(c[0]))
+    sentence = jitter_numbers(sentence)
+    if lead:
+        sentence = f"{lead} {lower_first(sentence) if lead[-1] == ',' or lead[-1].isalpha() else sentence}"
+    return sentence, tags
+
+
+def headline(sentence):
+    """A title from the opening words of a sentence, minus any spoken lead-in."""
+    for lead in VOICE_FILLERS + VOICE_TANGENTS:
+        if sentence.startswith(lead + " "):
+            sentence = sentence[len(lead) + 1:]
+            break
+    words = [w.strip(TITLE_PUNCTUATION) for w in sentence.split()[:random.randint(*TITLE_WORDS)]]
+    words = [w for w in words if w]
+    while len(words) > 1 and words[-1].lower() in TITLE_DANGLING:
+        words.pop()
+    title = " ".join(words)
+    return title[:1].upper() + title[1:]
+
+
+def synthesize_title(template, sentences, days, seen_titles):
+    """Title a synthesized note so its vault filename is new on its days.
+
+    The exporters name files date-slug, so two notes with one slug on the
+    same day overwrite each other. Python dates a note in its own offset and
+    TS in UTC, hence `days` holds both. A taken title is redrawn from
+    another of the note's sentences a few times, then numbered.
+
+    Args:
+        template: Template note the content opens with
+        sentences: The note's sentences, opener first
+        days: Dates the note's vault filename can carry
+        seen_titles: (date, slug) pairs already used, each mapped to the
+            number to try first when that title has to be numbered; updated
+    """
+    def is_new(title):
+        slug = create_slug(title)
+        return slug and all((day, slug) not in seen_titles for day in days)
+
+    # The opener is the template's own sentence, so prefer the body
+    body = sentences[1:] or sentences
+    title = None
+    for _ in range(TITLE_RETRIES):
+        phrase = headline(random.choice(body))
+        if phrase and random.random() < SUBTITLE_RATE:
+            title = f"{template['title']}: {phrase}"
+        else:
+            title = phrase or template["title"]
+        if is_new(title):
+            break
+    else:
+        # Number it, dropping trailing words while the number would fall
+        # outside the truncated slug
+        base_keys = [(day, create_slug(title)) for day in days]
+        words = title.split()
+        number = max(seen_titles.get(key, 2) for key in base_keys)
+        title = f"{' '.join(words)} {number}"
+        while not is_new(title):
+            if create_slug(title).endswith(f"-{number}"):
+                number += 1
+            elif len(words) > 1:
+                words.pop()
+            else:
+                words[0] = words[0][:-1]
+            title = f"{' '.join(words)} {number}"
+        seen_titles.update((key, number + 1) for key in base_keys)
+
+    slug = create_slug(title)
+    seen_titles.update(((day, slug), 2) for day in days)
+    return title
+
+
+def synthesize_note(pool, fragments, all_fragments, profile, seen_hashes, days, seen_titles):
+    """Recombine a domain's sentences into a new note of the profile's length.
+
+    Args:
+        pool: Template notes of the domain (titles come from here)
+        fragments: split_fragments(pool)
+        all_fragments: Fragments of every domain, for voice-memo tangents
+        profile: Key of LENGTH_PROFILES
+        seen_hashes: sha256 digests of content already generated; updated
+        days, seen_titles: See synthesize_title()
+
+    Returns:
+        Dict with title, content and tags. Except for captures, the content
+        opens with the first sentence of a template from the pool. Its
+        sha256 is not in seen_hashes: on a collision the note grows by
+        another sentence until it is new, which always terminates since it
+        only gets longer. The title comes from synthesize_title().
+    """
+    template = random.choice(pool)
+    voice = profile == "voice-memo"
+    target = target_length(profile)
+    max_length = LENGTH_PROFILES[profile][3]
+
+    # Captures are too short to spend on the template's opening sentence
+    if profile == "capture":
+        opener = next_sentence(fragments, all_fragments, voice, target)[0]
+    else:
+        opener = jitter_numbers(SENTENCE_SPLIT.split(template["content"])[0])
+    parts = [opener]
+    sentences = [opener]
+    tags = list(template["tags"])
+    length = len(opener) + 1
+    since_break = 1
+    while length < target:
+        sentence, sentence_tags = next_sentence(fragments, all_fragments, voice, max(target - length, 40))
+        if length + len(sentence) > max_length:
+            break
+        # Paragraph breaks every few sentences, except in dictated memos
+        if not voice and since_break >= 3 and random.random() < 0.3:
+            parts.append("\n\n")
+            since_break = 0
+        else:
+            parts.append(" ")
+        parts.append(sentence)
+        sentences.append(sentence)
+        length += len(sentence) + 1
+        since_break += 1
+        for tag in sentence_tags:
+            if tag not in tags and len(tags) < 4:
+                tags.append(tag)
+
+    content = "".join(parts)
+    if random.random() < PREFIX_RATE:
+        content = random.choice(PREFIXES) + lower_first(content)
+    if voice:
+        content = "Okay, recording. " + content
+
+    digest = hashlib.sha256(content.encode()).digest()
+    while digest in seen_hashes:
+        content += " " + next_sentence(fragments, all_fragments, voice, max(target // 4, 40))[0]
+        digest = hashlib.sha256(content.encode()).digest()
+    seen_hashes.add(digest)
+
+    title = synthesize_title(template, sentences, days, seen_titles)
+    return {"title": title, "content": content, "tags": tags}
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate the Selene dev fixture")
+    parser.add_argument("--count", type=int, help="Notes to synthesize (implies --synthesize)")
+    parser.add_argument("--synthesize", action="store_true",
+                        help="Recombine sentences into unique notes instead of repeating templates")
+    parser.add_argument("--length-mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_LENGTH_MIX.items()),
+                        help="Length profile weights, e.g. capture=0.2,standard=0.6,long=0.12,voice-memo=0.08")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fixture-dir", help="Output directory (default: fixtures/)")
+    args = parser.parse_args()
+
+    synthesize = args.synthesize or args.count is not None
+    try:
+        length_mix = parse_length_mix(args.length_mix)
+    except ValueError as e:
+        parser.error(str(e))
+    random.seed(args.seed)
+
     start = datetime(2025, 11, 15)
     end = datetime(2026, 2, 15)
-    target = 560
+    target = args.count or DEFAULT_TARGET
 
-    timestamps = gen_timestamps(start, end, target)
+    # The default rate yields ~540 notes; scale it up with headroom so
+    # large counts are trimmed down to rather than falling short
+    daily_scale = target * 1.25 / DEFAULT_TARGET if target > DEFAULT_TARGET else 1.0
+    timestamps = gen_timestamps(start, end, target, daily_scale)
 
     # Build weighted pools
     pools = [
@@ -306,42 +698,36 @@ def main():
         (RANDOM_CAPTURES, 0.04),
     ]
 
+    # Pools are lists, so fragments are keyed by identity
+    fragments = {id(pool): split_fragments(pool) for pool, _ in pools}
+    all_fragments = [f for pool_fragments in fragments.values() for f in pool_fragments]
+    seen_hashes = set()
+    seen_titles = {}
+    profiles = []
+
     # Track usage to avoid too many repeats
     usage_count = {}
 
     notes = []
     for i, ts in enumerate(timestamps):
-        month = ts.month
-        day_of_week = ts.weekday()
-        hour = ts.hour
-
         # Adjust weights by context
-        adjusted_pools = []
-        for pool, weight in pools:
-            w = weight
-            # More work during weekday work hours
-            if pool in (WORK_MISE, WORK_JOB) and day_of_week < 5 and 9 <= hour <= 17:
-                w *= 1.5
-            # Less work on weekends
-            if pool in (WORK_MISE, WORK_JOB) and day_of_week >= 5:
-                w *= 0.3
-            # More ceramics on Saturday mornings
-            if pool == CERAMICS and day_of_week == 5 and hour < 13:
-                w *= 2.0
-            # More sleep notes late at night
-            if pool == HEALTH_SLEEP and (hour >= 22 or hour <= 5):
-                w *= 2.0
-            # More Joshua Tree notes closer to Feb
-            if pool == PERSONAL_JOSHUA_TREE and month >= 1:
-                w *= 1.5
-            # More exercise notes morning/evening
-            if pool == HEALTH_EXERCISE and (6 <= hour <= 9 or 17 <= hour <= 20):
-                w *= 1.5
-            adjusted_pools.append((pool, w))
-
-        # Normalize
-        total_w = sum(w for _, w in adjusted_pools)
-        adjusted_pools = [(p, w/total_w) for p, w in adjusted_pools]
+        adjusted_pools = context_weights(pools, ts)
+
+        if synthesize:
+            pool = pick_pool(adjusted_pools)
+            profile = pick_profile(length_mix)
+            profiles.append(profile)
+            # Local date (Python exporter) and UTC date (TS exporter)
+            days = {ts.date(), (ts + timedelta(hours=8)).date()}
+            note = synthesize_note(pool, fragments[id(pool)], all_fragments, profile, seen_hashes,
+                                   days, seen_titles)
+            notes.append({
+                "title": note["title"],
+                "content": note["content"],
+                "created_at": format_timestamp(ts),
+                "tags": note["tags"],
+            })
+            continue
 
         # Pick note
         note_template = pick_note(i, len(timestamps), adjusted_pools)
@@ -354,13 +740,7 @@ def main():
         content = note_template["content"]
         if usage_count[key] > 1:
             # Add a prefix variation
-            prefixes = [
-                "Update: ", "Thinking more about this - ", "Following up: ",
-                "Quick note - ", "Revisiting this thought: ", "Adding to earlier note - ",
-                "More on this: ", "New development - ", "Realized something: ",
-                "Late night thought: ", "Morning reflection: ", "Post-coffee clarity: ",
-            ]
-            content = random.choice(prefixes) + content[0].lower() + content[1:]
+            content = random.choice(PREFIXES) + content[0].lower() + content[1:]
 
         notes.append({
             "title": note_template["title"],
@@ -372,17 +752,26 @@ def main():
     # Write output
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
-    fixture_dir = os.path.join(project_root, "fixtures")
+    fixture_dir = args.fixture_dir or os.path.join(project_root, "fixtures")
     os.makedirs(fixture_dir, exist_ok=True)
 
+    # Indented output goes through the pure-Python encoder; skip it for big fixtures
+    indent = 2 if len(notes) <= 10000 else None
+
     output_path = os.path.join(fixture_dir, "dev-seed-notes.json")
     with open(output_path, "w") as f:
-        json.dump(notes, f, indent=2)
+        json.dump(notes, f, indent=indent)
+
+    schedule_path = os.path.join(fixture_dir, "dev-arrival-schedule.json")
+    schedule = gen_arrival_schedule(timestamps, start)
+    with open(schedule_path, "w") as f:
+        json.dump(schedule, f, indent=indent)
 
     # Summary
     print(f"Generated {len(notes)} notes")
     print(f"Date range: {notes[0]['created_at']} to {notes[-1]['created_at']}")
     print(f"Output: {output_path}")
+    print(f"Arrival schedule: {schedule_path}")
 
     # Domain breakdown
     tag_counts = {}
@@ -404,6 +793,19 @@ def main():
     for month, count in sorted(monthly.items()):
         print(f"  {month}: {count}")
 
+    if synthesize:
+        lengths = {}
+        for profile, note in zip(profiles, notes):
+            lengths.setdefault(profile, []).append(len(note["content"]))
+        print(f"\nUnique content hashes: {len(seen_hashes)} / {len(notes)}")
+        print(f"Distinct titles: {len({note['title'] for note in notes})} / {len(notes)}")
+        print("Content length by profile (chars, p10 / p50 / p90 / max):")
+        for profile in LENGTH_PROFILES:
+            values = sorted(lengths.get(profile, []))
+            if values:
+                p10, p50, p90 = (values[int(len(values) * q)] for q in (0.1, 0.5, 0.9))
+                print(f"  {profile}: {len(values)} notes, {p10} / {p50} / {p90} / {values[-1]}")
+
 
 if __name__ == "__main__":
     main()
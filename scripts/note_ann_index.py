@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""
+Approximate nearest-neighbour index over note_embeddings
+
+IVF (inverted file) index with int8-quantized vectors. Embeddings are
+L2-normalized, clustered with spherical k-means into `nlist` lists and
+stored as int8 codes grouped by list, with one float scale per vector.
+A query ranks the centroids and scans only the `nprobe` closest lists, so
+its cost grows with N * nprobe / nlist rather than N.
+
+Newly embedded notes go into a small pending segment that every query scans
+in full; it is folded into the lists once it grows. Deleted or re-embedded
+rows are masked out until then. Centroids are retrained from the database
+when the corpus has grown well past the size they were trained on.
+
+Requires numpy.
+
+Usage:
+    python3 scripts/note_ann_index.py build             # train and index everything
+    python3 scripts/note_ann_index.py update            # pick up new/removed embeddings
+    python3 scripts/note_ann_index.py query 42 -k 10    # notes similar to note 42
+    python3 scripts/note_ann_index.py bench             # recall/latency vs exact search
+    python3 scripts/note_ann_index.py bench --synthetic 200000
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reported by main()
+    np = None
+
+
+ANN_INDEX_FORMAT = 1
+
+# Lists scanned per query as a share of nlist (at least ANN_MIN_NPROBE)
+ANN_NPROBE_SHARE = 1 / 128
+ANN_MIN_NPROBE = 8
+
+# Fold the pending segment into the lists once it holds this share of the index
+ANN_PENDING_SHARE = 0.05
+ANN_PENDING_MIN = 1024
+
+# Retrain centroids once the index is this many times the trained size
+ANN_RETRAIN_GROWTH = 4.0
+
+KMEANS_ITERATIONS = 12
+KMEANS_SAMPLE_PER_LIST = 64
+ASSIGN_BATCH = 8192
+
+ARRAY_FIELDS = (
+    'centroids', 'list_offsets', 'codes', 'scales', 'note_ids', 'row_ids', 'live',
+    'pending_codes', 'pending_scales', 'pending_note_ids', 'pending_row_ids',
+)
+
+
+def default_index_path(db_path):
+    """Index file lives next to the database unless SELENE_ANN_INDEX_PATH says otherwise"""
+    return os.environ.get(
+        'SELENE_ANN_INDEX_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(db_path)), 'note_ann_index.npz')
+    )
+
+
+def default_nlist(count):
+    return max(1, min(4096, int(round(4 * math.sqrt(count)))))
+
+
+def default_nprobe(nlist):
+    return min(nlist, max(ANN_MIN_NPROBE, int(round(nlist * ANN_NPROBE_SHARE))))
+
+
+# --- Vectors ---
+
+def normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def quantize(vectors):
+    """int8 codes plus a per-vector scale (code * scale ~ vector)"""
+    peak = np.abs(vectors).max(axis=1)
+    peak[peak == 0] = 1.0
+    scales = (peak / 127.0).astype(np.float32)
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales
+
+
+def assign_lists(centroids, vectors):
+    """Index of the closest centroid (by cosine) for each vector"""
+    assignment = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BATCH):
+        chunk = vectors[start:start + ASSIGN_BATCH]
+        assignment[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignment
+
+
+def train_centroids(vectors, nlist, seed=0, iterations=KMEANS_ITERATIONS):
+    """Spherical k-means on a sample of the (normalized) vectors"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = assign_lists(centroids, sample)
+        order = np.argsort(assignment, kind='stable')
+        sorted_lists = assignment[order]
+        starts = np.flatnonzero(np.r_[True, sorted_lists[1:] != sorted_lists[:-1]])
+
+        sums = np.zeros_like(centroids)
+        sums[sorted_lists[starts]] = np.add.reduceat(sample[order], starts, axis=0)
+        empty = np.bincount(assignment, minlength=nlist) == 0
+        centroids = normalize(sums)
+        if empty.any():
+            # Reseed lists that lost all their members
+            centroids[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+
+    return centroids
+
+
+# --- Index ---
+
+def empty_segment(dim):
+    return {
+        'codes': np.empty((0, dim), dtype=np.int8),
+        'scales': np.empty(0, dtype=np.float32),
+        'note_ids': np.empty(0, dtype=np.int64),
+        'row_ids': np.empty(0, dtype=np.int64),
+    }
+
+
+def layout_lists(index, lists, codes, scales, note_ids, row_ids):
+    """Store vectors grouped by list so each list is one contiguous slice"""
+    order = np.argsort(lists, kind='stable')
+    counts = np.bincount(lists, minlength=len(index['centroids']))
+    index['list_offsets'] = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    index['codes'] = codes[order]
+    index['scales'] = scales[order]
+    index['note_ids'] = note_ids[order]
+    index['row_ids'] = row_ids[order]
+    index['live'] = np.ones(len(order), dtype=bool)
+
+
+def build_index(note_ids, row_ids, vectors, nlist=None, nprobe=None, model_version=None, seed=0):
+    """Train centroids and index every vector
+
+    Args:
+        note_ids: raw_notes ids, one per vector
+        row_ids: note_embeddings ids, used to detect added/removed rows later
+        vectors: float array of shape (n, dim)
+
+    Returns:
+        Index dict (see ARRAY_FIELDS) ready for search() / save_index()
+    """
+    vectors = normalize(np.asarray(vectors, dtype=np.float32))
+    count, dim = vectors.shape
+    nlist = min(count, nlist or default_nlist(count))
+
+    index = {
+        'format': ANN_INDEX_FORMAT,
+        'dim': dim,
+        'nprobe': nprobe or default_nprobe(nlist),
+        'model_version': model_version,
+        'trained_count': count,
+        'centroids': train_centroids(vectors, nlist, seed=seed),
+    }
+    codes, scales = quantize(vectors)
+    layout_lists(index, assign_lists(index['centroids'], vectors), codes, scales,
+                 np.asarray(note_ids, dtype=np.int64), np.asarray(row_ids, dtype=np.int64))
+    pending = empty_segment(dim)
+    for key, value in pending.items():
+        index['pending_' + key] = value
+    return index
+
+
+def index_size(index):
+    return int(index['live'].sum()) + len(index['pending_row_ids'])
+
+
+def add_vectors(index, note_ids, row_ids, vectors):
+    """Append newly embedded notes to the pending segment"""
+    vectors = normalize(np.asarray(vectors, dtype=np.float32))
+    codes, scales = quantize(vectors)
+    index['pending_codes'] = np.concatenate([index['pending_codes'], codes])
+    index['pending_scales'] = np.concatenate([index['pending_scales'], scales])
+    index['pending_note_ids'] = np.concatenate([index['pending_note_ids'], np.asarray(note_ids, dtype=np.int64)])
+    index['pending_row_ids'] = np.concatenate([index['pending_row_ids'], np.asarray(row_ids, dtype=np.int64)])
+
+
+def remove_rows(index, row_ids):
+    """Drop note_embeddings rows that no longer exist (deleted or re-embedded)"""
+    row_ids = np.asarray(row_ids, dtype=np.int64)
+    if not len(row_ids):
+        return
+    index['live'] &= ~np.isin(index['row_ids'], row_ids)
+    keep = ~np.isin(index['pending_row_ids'], row_ids)
+    for key in ('codes', 'scales', 'note_ids', 'row_ids'):
+        index['pending_' + key] = index['pending_' + key][keep]
+
+
+def compact(index):
+    """Fold pending vectors into their lists and drop masked-out rows"""
+    live = index['live']
+    pending_codes = index['pending_codes']
+    pending_lists = assign_lists(
+        index['centroids'], pending_codes.astype(np.float32) * index['pending_scales'][:, None]
+    )
+    main_lists = np.repeat(np.arange(len(index['centroids']), dtype=np.int32),
+                           np.diff(index['list_offsets']))[live]
+    layout_lists(
+        index,
+        np.concatenate([main_lists, pending_lists]),
+        np.concatenate([index['codes'][live], pending_codes]),
+        np.concatenate([index['scales'][live], index['pending_scales']]),
+        np.concatenate([index['note_ids'][live], index['pending_note_ids']]),
+        np.concatenate([index['row_ids'][live], index['pending_row_ids']]),
+    )
+    for key, value in empty_segment(index['dim']).items():
+        index['pending_' + key] = value
+
+
+def needs_compaction(index):
+    dirty = len(index['pending_row_ids']) + int((~index['live']).sum())
+    return dirty > max(ANN_PENDING_MIN, ANN_PENDING_SHARE * len(index['row_ids']))
+
+
+def search(index, vector, k=10, nprobe=None, exclude_note_id=None):
+    """Top-k approximate neighbours by cosine similarity
+
+    Args:
+        vector: Query embedding (any scale; normalized here)
+        nprobe: Lists to scan (defaults to the index's nprobe)
+        exclude_note_id: raw_notes id to leave out (the query note itself)
+
+    Returns:
+        List of {'raw_note_id', 'similarity'} dicts, most similar first
+    """
+    q = np.asarray(vector, dtype=np.float32)
+    q = q / (np.linalg.norm(q) or 1.0)
+
+    centroids = index['centroids']
+    nprobe = min(len(centroids), nprobe or index['nprobe'])
+    centroid_scores = centroids @ q
+    if nprobe < len(centroids):
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+    else:
+        probe = np.arange(len(centroids))
+
+    offsets = index['list_offsets']
+    slices = [slice(offsets[l], offsets[l + 1]) for l in probe]
+    codes = np.concatenate([index['codes'][s] for s in slices] + [index['pending_codes']])
+    scales = np.concatenate([index['scales'][s] for s in slices] + [index['pending_scales']])
+    note_ids = np.concatenate([index['note_ids'][s] for s in slices] + [index['pending_note_ids']])
+    live = np.concatenate([index['live'][s] for s in slices]
+                          + [np.ones(len(index['pending_row_ids']), dtype=bool)])
+
+    scores = (codes.astype(np.float32) @ q) * scales
+    scores[~live] = -np.inf
+    if exclude_note_id is not None:
+        scores[note_ids == exclude_note_id] = -np.inf
+
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [
+        {'raw_note_id': int(note_ids[i]), 'similarity': round(min(1.0, float(scores[i])), 4)}
+        for i in top if np.isfinite(scores[i])
+    ]
+
+
+def save_index(index, path):
+    """Write atomically so a concurrent reader never sees a partial file"""
+    meta = {key: index[key] for key in ('format', 'dim', 'nprobe', 'model_version', 'trained_count')}
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **{key: index[key] for key in ARRAY_FIELDS})
+    os.replace(tmp_path, path)
+
+
+def load_index(path):
+    with np.load(path, allow_pickle=False) as data:
+        index = json.loads(str(data['meta']))
+        if index.get('format') != ANN_INDEX_FORMAT:
+            raise ValueError(f"Unsupported ANN index format in {path} - rebuild it")
+        for key in ARRAY_FIELDS:
+            index[key] = data[key]
+    return index
+
+
+# --- Database ---
+
+def load_embeddings(conn, row_ids=None):
+    """Read note_embeddings rows (JSON float arrays) into one float32 matrix
+
+    Args:
+        row_ids: Only these note_embeddings ids (default: every row)
+
+    Returns:
+        (note_ids, row_ids, vectors, model_version)
+    """
+    if row_ids is None:
+        count = conn.execute("SELECT COUNT(*) FROM note_embeddings").fetchone()[0]
+        rows = conn.execute("SELECT id, raw_note_id, embedding, model_version FROM note_embeddings ORDER BY id")
+    else:
+        row_ids = [int(row_id) for row_id in row_ids]
+        count = len(row_ids)
+        rows = conn.execute("""
+        SELECT id, raw_note_id, embedding, model_version
+        FROM note_embeddings
+        WHERE id IN (SELECT value FROM json_each(?))
+        ORDER BY id
+        """, (json.dumps(row_ids),))
+
+    note_ids = np.empty(count, dtype=np.int64)
+    ids = np.empty(count, dtype=np.int64)
+    vectors = None
+    model_versions = set()
+    filled = 0
+    for row_id, raw_note_id, embedding, model_version in rows:
+        vector = json.loads(embedding)
+        if vectors is None:
+            vectors = np.empty((count, len(vector)), dtype=np.float32)
+        elif len(vector) != vectors.shape[1]:
+            raise ValueError(f"note_embeddings row {row_id} has {len(vector)} dimensions, expected {vectors.shape[1]}")
+        vectors[filled] = vector
+        note_ids[filled] = raw_note_id
+        ids[filled] = row_id
+        model_versions.add(model_version)
+        filled += 1
+
+    if vectors is None:
+        return note_ids[:0], ids[:0], np.empty((0, 0), dtype=np.float32), None
+    if len(model_versions) > 1:
+        print(f"Warning: mixed embedding models {sorted(model_versions)}", file=sys.stderr)
+    return note_ids[:filled], ids[:filled], vectors[:filled], ','.join(sorted(model_versions))
+
+
+def build_from_db(conn, nlist=None, nprobe=None):
+    note_ids, row_ids, vectors, model_version = load_embeddings(conn)
+    if not len(row_ids):
+        raise ValueError('note_embeddings is empty - nothing to index')
+    return build_index(note_ids, row_ids, vectors, nlist=nlist, nprobe=nprobe, model_version=model_version)
+
+
+def sync_index(conn, index):
+    """Bring the index in line with note_embeddings without retraining
+
+    Rows are tracked by note_embeddings.id: new ids are embedded notes to add,
+    vanished ids were deleted or replaced (INSERT OR REPLACE issues a new id).
+
+    Returns:
+        Dict of sync statistics
+    """
+    current = np.array([row[0] for row in conn.execute("SELECT id FROM note_embeddings")], dtype=np.int64)
+    indexed = np.concatenate([index['row_ids'][index['live']], index['pending_row_ids']])
+    removed = np.setdiff1d(indexed, current)
+    added = np.setdiff1d(current, indexed)
+
+    remove_rows(index, removed)
+    if len(added):
+        note_ids, row_ids, vectors, _ = load_embeddings(conn, added)
+        if vectors.shape[1] != index['dim']:
+            raise ValueError(f"Embedding dimension changed ({index['dim']} -> {vectors.shape[1]}) - run build")
+        add_vectors(index, note_ids, row_ids, vectors)
+
+    compacted = needs_compaction(index)
+    if compacted:
+        compact(index)
+    return {
+        'added': len(added),
+        'removed': len(removed),
+        'compacted': compacted,
+        'pending': len(index['pending_row_ids']),
+        'size': index_size(index),
+    }
+
+
+def note_vector(conn, raw_note_id):
+    row = conn.execute("SELECT embedding FROM note_embeddings WHERE raw_note_id = ?", (raw_note_id,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def similar_notes(conn, index, raw_note_id, k=10, nprobe=None):
+    """Approximate top-k notes similar to an embedded note (None if it has no embedding)"""
+    vector = note_vector(conn, raw_note_id)
+    if vector is None:
+        return None
+    return search(index, vector, k=k, nprobe=nprobe, exclude_note_id=raw_note_id)
+
+
+# --- Benchmark ---
+
+def synthetic_embeddings(count, dim=768, topics=None, seed=0):
+    """Clustered unit vectors standing in for a large corpus
+
+    Each note mixes a primary and a secondary topic direction plus noise,
+    which is closer to real embedding geometry than uniform noise (where
+    every neighbour is equally far away and no index can do well) or
+    disjoint clusters (where any index looks perfect).
+    """
+    rng = np.random.default_rng(seed)
+    topics = topics or max(1, count // 100)
+    centers = normalize(rng.standard_normal((topics, dim), dtype=np.float32))
+    primary = rng.integers(0, topics, count)
+    secondary = rng.integers(0, topics, count)
+    mix = rng.uniform(0.0, 0.7, count).astype(np.float32)[:, None]
+    spread = rng.uniform(0.6, 1.4, count).astype(np.float32)[:, None]
+    vectors = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, ASSIGN_BATCH):
+        end = min(count, start + ASSIGN_BATCH)
+        noise = rng.standard_normal((end - start, dim), dtype=np.float32) / math.sqrt(dim)
+        vectors[start:end] = (centers[primary[start:end]] + mix[start:end] * centers[secondary[start:end]]
+                              + noise * spread[start:end])
+    return normalize(vectors)
+
+
+def exact_top_k(vectors, query, k, exclude):
+    scores = vectors @ query
+    scores[exclude] = -np.inf
+    top = np.argpartition(-scores, k - 1)[:k]
+    return set(top[np.argsort(-scores[top])].tolist())
+
+
+def percentile(sorted_values, pct):
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_benchmark(note_ids, vectors, k=10, queries=500, nprobes=None, nlist=None, seed=0):
+    """Recall@k and latency of search() against exact brute-force search
+
+    A tenth of the corpus is held out of training and added afterwards via
+    add_vectors() + compact(), so the incremental path is measured too.
+    """
+    rng = np.random.default_rng(seed)
+    vectors = normalize(np.asarray(vectors, dtype=np.float32))
+    note_ids = np.asarray(note_ids, dtype=np.int64)
+    count = len(vectors)
+    initial = count - count // 10
+
+    started = time.perf_counter()
+    index = build_index(note_ids[:initial], np.arange(initial), vectors[:initial], nlist=nlist, seed=seed)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    add_vectors(index, note_ids[initial:], np.arange(initial, count), vectors[initial:])
+    compact(index)
+    update_seconds = time.perf_counter() - started
+
+    sample = rng.choice(count, min(queries, count), replace=False)
+    position = {int(note_id): i for i, note_id in enumerate(note_ids)}
+    exact = [exact_top_k(vectors, vectors[i], k, i) for i in sample]
+
+    results = []
+    for nprobe in nprobes or [index['nprobe']]:
+        latencies = []
+        hits = 0
+        for i, truth in zip(sample, exact):
+            started = time.perf_counter()
+            found = search(index, vectors[i], k=k, nprobe=nprobe, exclude_note_id=int(note_ids[i]))
+            latencies.append(time.perf_counter() - started)
+            hits += len(truth & {position[hit['raw_note_id']] for hit in found})
+        latencies.sort()
+        results.append({
+            'nprobe': nprobe,
+            'recall_at_k': round(hits / (len(sample) * k), 4),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        })
+
+    exact_latencies = []
+    for i in sample[:50]:
+        started = time.perf_counter()
+        exact_top_k(vectors, vectors[i], k, i)
+        exact_latencies.append(time.perf_counter() - started)
+    exact_latencies.sort()
+
+    return {
+        'notes': count,
+        'dim': int(vectors.shape[1]),
+        'nlist': len(index['centroids']),
+        'k': k,
+        'queries': len(sample),
+        'build_seconds': round(build_seconds, 2),
+        'incremental_add_seconds': round(update_seconds, 2),
+        'incremental_added': count - initial,
+        'exact_p50_ms': round(percentile(exact_latencies, 50) * 1000, 3),
+        'ann': results,
+    }
+
+
+def main():
+    """Command-line entry point
+
+    Usage:
+        note_ann_index.py build|update|query|bench [options]
+    """
+    parser = argparse.ArgumentParser(description='Approximate nearest-neighbour index over note embeddings')
+    parser.add_argument('--db', default=os.environ.get('SELENE_DB_PATH', '/selene/data/selene.db'))
+    parser.add_argument('--index', help='Index file (default: note_ann_index.npz next to the database)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='Train centroids and index every embedding')
+    build.add_argument('--nlist', type=int, help='Number of lists (default ~4*sqrt(N))')
+    build.add_argument('--nprobe', type=int, help='Lists scanned per query by default')
+
+    sub.add_parser('update', help='Add new and drop removed embeddings')
+
+    query = sub.add_parser('query', help='Notes similar to a note')
+    query.add_argument('note_id', type=int)
+    query.add_argument('-k', type=int, default=10)
+    query.add_argument('--nprobe', type=int)
+
+    bench = sub.add_parser('bench', help='Recall and latency against exact search')
+    bench.add_argument('--synthetic', type=int, help='Use N synthetic vectors instead of the database')
+    bench.add_argument('--dim', type=int, default=768)
+    bench.add_argument('-k', type=int, default=10)
+    bench.add_argument('--queries', type=int, default=500)
+    bench.add_argument('--nlist', type=int)
+    bench.add_argument('--nprobe', type=int, nargs='+', help='nprobe values to compare')
+
+    args = parser.parse_args()
+
+    if np is None:
+        print(json.dumps({'success': False, 'error': 'numpy is required: pip3 install numpy'}))
+        sys.exit(1)
+
+    index_path = args.index or default_index_path(args.db)
+
+    try:
+        if args.command == 'bench':
+            if args.synthetic:
+                vectors = synthetic_embeddings(args.synthetic, args.dim)
+                note_ids = np.arange(1, len(vectors) + 1)
+            else:
+                conn = sqlite3.connect(args.db)
+                note_ids, _, vectors, _ = load_embeddings(conn)
+                conn.close()
+            print(json.dumps(run_benchmark(note_ids, vectors, k=args.k, queries=args.queries,
+                                           nprobes=args.nprobe, nlist=args.nlist), indent=2))
+            return
+
+        conn = sqlite3.connect(args.db)
+
+        if args.command == 'build':
+            started = time.perf_counter()
+            index = build_from_db(conn, nlist=args.nlist, nprobe=args.nprobe)
+            save_index(index, index_path)
+            print(json.dumps({
+                'success': True,
+                'index': index_path,
+                'size': index_size(index),
+                'nlist': len(index['centroids']),
+                'nprobe': index['nprobe'],
+                'seconds': round(time.perf_counter() - started, 2),
+            }))
+
+        elif args.command == 'update':
+            if not os.path.exists(index_path):
+                index = build_from_db(conn)
+                stats = {'rebuilt': True, 'size': index_size(index)}
+            else:
+                index = load_index(index_path)
+                stats = sync_index(conn, index)
+                stats['rebuilt'] = index_size(index) > ANN_RETRAIN_GROWTH * index['trained_count']
+                if stats['rebuilt']:
+                    index = build_from_db(conn)
+            save_index(index, index_path)
+            print(json.dumps({'success': True, 'index': index_path, **stats}))
+
+        elif args.command == 'query':
+            index = load_index(index_path)
+            started = time.perf_counter()
+            results = similar_notes(conn, index, args.note_id, k=args.k, nprobe=args.nprobe)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if results is None:
+                print(json.dumps({'success': False, 'error': f'Note {args.note_id} has no embedding'}))
+                sys.exit(1)
+            print(json.dumps({
+                'success': True,
+                'note_id': args.note_id,
+                'results': results,
+                'query_ms': round(elapsed_ms, 3),
+            }))
+
+        conn.close()
+
+    except (ValueError, FileNotFoundError, sqlite3.Error) as e:
+        print(json.dumps({'success': False, 'error': str(e)}))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
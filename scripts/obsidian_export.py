@@ -5,73 +5,592 @@ Exports processed notes with ADHD-optimized formatting to Obsidian vault
 """
 
 import sqlite3
+import fcntl
+import hashlib
 import json
+from contextlib import contextmanager
+import math
 import os
+import struct
 from datetime import datetime
 from pathlib import Path
 import re
+import socket
+import tempfile
+
+# orjson decodes the remaining JSON columns several times faster than the
+# stdlib; SELENE_JSON_DECODER=stdlib forces the fallback (for benchmarking)
+try:
+    if os.environ.get('SELENE_JSON_DECODER') == 'stdlib':
+        raise ImportError
+    import orjson
+    json_loads = orjson.loads
+    JSON_DECODER = 'orjson'
+except ImportError:
+    json_loads = json.loads
+    JSON_DECODER = 'json'
+
+
+# Folders a vault target can lay notes out into (under <vault>/Selene/)
+VAULT_LAYOUTS = ('timeline', 'concept', 'theme', 'energy')
+
+DEFAULT_TARGET_NAME = 'default'
+TARGET_FILTER_KEYS = ('themes', 'energy', 'concepts')
+
+# Notes claimed per batch, and how long a claim lasts before another
+# exporter may take the note over
+EXPORT_BATCH_SIZE = 50
+EXPORT_LEASE_SECONDS = int(os.environ.get('SELENE_EXPORT_LEASE_SECONDS', '300'))
+
+# Related notes listed at the bottom of each exported note. Candidates are
+# over-fetched because each target only links the ones it holds.
+RELATED_NOTES_LIMIT = 5
+RELATED_NOTES_OVERFETCH = 4
+RELATED_NOTES_HEADING = '## 🔗 Related Notes'
+RELATED_NOTES_PLACEHOLDER = '*Obsidian will automatically show backlinks here based on shared concepts and tags*'
+
+# Section of each note that --sync-actions reads back from the vault
+ACTION_ITEMS_HEADING = '## ✅ Action Items Detected'
+ACTION_ITEM_LINE = re.compile(r'^\s*[-*]\s+\[([ xX])\]\s+(.+?)\s*$')
+
+# Compact bundle for SeleneChat/SeleneMobile, written to <vault>/Selene/.
+# Layout (little-endian):
+#   header   magic 'SLNB', u16 version, u16 reserved, u32 record count, u64 index offset
+#   records  u32 length + UTF-8 JSON object, one per note (appended on re-export)
+#   index    record count x (i64 raw_note_id, u64 record offset, u32 length), sorted by id
+# The header is rewritten last, so a reader never follows a half-written index.
+MOBILE_BUNDLE_FILENAME = 'selene-notes.bundle'
+MOBILE_BUNDLE_MAGIC = b'SLNB'
+MOBILE_BUNDLE_VERSION = 1
+MOBILE_BUNDLE_HEADER = struct.Struct('<4sHHIQ')
+MOBILE_BUNDLE_LENGTH = struct.Struct('<I')
+MOBILE_BUNDLE_INDEX_ENTRY = struct.Struct('<qQI')
+# Rewrite the bundle once superseded records outweigh live ones
+MOBILE_BUNDLE_COMPACT_MIN_BYTES = 64 * 1024
+
+# Generated member list on concept hub pages
+CONCEPT_NOTES_START = '<!-- selene:concept-notes -->'
+CONCEPT_NOTES_END = '<!-- /selene:concept-notes -->'
+CONCEPT_HUB_MAX_NOTES = 100
+
+# Keyword fallback: how many distinctive words from a note go into the
+# FTS query, and words too common to say anything about relatedness
+FTS_QUERY_TERMS = 8
+# Words found in more than this share of notes are left out of the query:
+# they barely move BM25 but widen the set of notes it has to score
+FTS_MAX_DOC_SHARE = 0.005
+FTS_STOPWORDS = frozenset("""
+    about after again also because been before being could didn does doing done
+    down each even every from getting going have having here into just know like
+    made make more most much need only other over really should some still such
+    than that their them then there these they thing things think this those
+    through time today very want well were what when where which while will with
+    would your
+""".split())
+
+
+def table_exists(conn, table_name):
+    """Check whether a table exists (newer migrations may not be applied yet)"""
+    row = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table_name,)
+    ).fetchone()
+    return row[0] > 0
+
+
+def load_vault_targets():
+    """Load vault targets from the environment
+
+    OBSIDIAN_VAULT_TARGETS may hold a JSON list of targets, e.g.
+        [{"name": "default", "path": "/selene/vault"},
+         {"name": "mobile", "path": "/selene/mobile-vault",
+          "layouts": ["timeline"], "filter": {"energy": ["high", "medium"]}}]
+
+    Without it, a single 'default' target is built from OBSIDIAN_VAULT_PATH
+    using every layout, which matches the original single-vault behaviour.
+    Every target also gets the mobile bundle unless it sets "bundle": false.
+
+    Raises ValueError for malformed JSON, duplicate names (targets share
+    export state by name), a missing path, and unknown layouts or filter
+    keys (a misspelt key would otherwise accept every note).
+    """
+    raw_targets = os.environ.get('OBSIDIAN_VAULT_TARGETS')
+    if not raw_targets:
+        return [{
+            'name': DEFAULT_TARGET_NAME,
+            'path': os.environ.get('OBSIDIAN_VAULT_PATH', '/selene/vault'),
+            'layouts': list(VAULT_LAYOUTS),
+            'filter': {},
+            'bundle': True
+        }]
+
+    targets = []
+    for target in json.loads(raw_targets):
+        name = target.get('name') or DEFAULT_TARGET_NAME
+        if any(existing['name'] == name for existing in targets):
+            raise ValueError(f"Duplicate target name: {name}")
+        if not target.get('path'):
+            raise ValueError(f"Target {name} has no path")
+        layouts = target.get('layouts') or list(VAULT_LAYOUTS)
+        unknown = [layout for layout in layouts if layout not in VAULT_LAYOUTS]
+        if unknown:
+            raise ValueError(f"Unknown layout(s) for target {name}: {', '.join(unknown)}")
+        note_filter = target.get('filter') or {}
+        unknown = [key for key in note_filter if key not in TARGET_FILTER_KEYS]
+        if unknown:
+            raise ValueError(f"Unknown filter key(s) for target {name}: {', '.join(unknown)}")
+        targets.append({
+            'name': name,
+            'path': os.path.expanduser(target['path']),
+            'layouts': layouts,
+            'filter': note_filter,
+            'bundle': target.get('bundle', True)
+        })
+    return targets
+
+
+def note_matches_target(markdown_data, target):
+    """Check a rendered note against a target's filter
+
+    Filter keys are optional lists: 'themes' (primary theme), 'energy'
+    (energy level) and 'concepts' (any shared concept). An empty filter
+    accepts every note.
+    """
+    note_filter = target.get('filter') or {}
+
+    themes = note_filter.get('themes')
+    if themes and markdown_data['theme'] not in themes:
+        return False
+
+    energy = note_filter.get('energy')
+    if energy and markdown_data['energy'] not in energy:
+        return False
+
+    concepts = note_filter.get('concepts')
+    if concepts and not set(concepts) & set(markdown_data['concepts']):
+        return False
+
+    return True
+
+
+# The parts of processed_notes.sentiment_data the renderer uses, pulled out
+# by SQLite as one small JSON array so the (much larger) blob is never
+# decoded in Python. The blob is validated once and read with a single
+# multi-path json_extract: repeating the expression per field made SQLite
+# re-validate and re-parse it for every column. Malformed blobs read as {}
+# like parse_json_field did. json_extract returns null for a missing key, so
+# has_stress_indicators tells an explicit null apart from a missing flag.
+# Decoded by note_sentiment().
+SENTIMENT_BLOB = "CASE WHEN json_valid(pn.sentiment_data) THEN pn.sentiment_data ELSE '{}' END"
+SENTIMENT_PATHS = (
+    '$.adhd_markers',
+    '$.stress_indicators',
+    '$.analysis_confidence',
+    '$.key_emotions',
+)
+SENTIMENT_COLUMNS = f"""json_extract(
+                {SENTIMENT_BLOB},
+                {', '.join(f"'{path}'" for path in SENTIMENT_PATHS)}
+            ) AS sentiment_fields,
+            json_type({SENTIMENT_BLOB}, '$.stress_indicators') IS NOT NULL AS has_stress_indicators"""
+
+
+def export_select_sql(per_target):
+    """SELECT ... FROM clause shared by the export queries
+
+    With per-target tracking, exported_targets carries the names of the
+    targets that already have the note (separated by char(31)).
+    """
+    exported_targets_column = """,
+            (SELECT group_concat(oe.target, char(31))
+             FROM obsidian_exports oe
+             WHERE oe.raw_note_id = rn.id) AS exported_targets""" if per_target else ''
+
+    return f"""SELECT
+            rn.id, rn.title, rn.content, rn.created_at, rn.tags, rn.word_count,
+            pn.concepts, pn.primary_theme, pn.secondary_themes,
+            pn.overall_sentiment, pn.sentiment_score, pn.emotional_tone,
+            pn.energy_level, {SENTIMENT_COLUMNS}{exported_targets_column}
+        FROM raw_notes rn
+        JOIN processed_notes pn ON rn.id = pn.raw_note_id"""
+
+
+def column_exists(conn, table_name, column_name):
+    """Check whether a column exists (newer migrations may not be applied yet)"""
+    columns = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+    return any(column[1] == column_name for column in columns)
+
 
+def export_schema(conn):
+    """Probe the optional schema once for a whole export batch
+
+    Each sqlite_master / table_info probe costs a schema parse, which adds
+    up when repeated for every note and target.
+
+    Returns:
+        Set of table names, plus 'raw_notes.export_claimed_by' when export
+        leases (migration 022) are available
+    """
+    schema = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if column_exists(conn, 'raw_notes', 'export_claimed_by'):
+        schema.add('raw_notes.export_claimed_by')
+    return schema
 
-def get_notes_for_export(db_path, note_id=None):
+
+def default_worker_id():
+    """Identify this exporter process in export leases"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_notes_for_export(conn, where_sql, params, worker_id, lease_seconds, limit):
+    """Atomically claim up to `limit` notes matching where_sql for this worker
+
+    A note is claimable when it is unclaimed, its lease has expired (the
+    previous worker crashed or stalled), or this worker already holds it.
+    BEGIN IMMEDIATE takes the write lock up front, so concurrent exporters
+    serialize here and never receive the same note.
+
+    Returns:
+        List of claimed raw_notes ids
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        rows = conn.execute(f"""
+        UPDATE raw_notes
+        SET export_claimed_by = ?,
+            export_lease_expires_at = datetime('now', ?)
+        WHERE id IN (
+            SELECT rn.id
+            FROM raw_notes rn
+            JOIN processed_notes pn ON rn.id = pn.raw_note_id
+            WHERE {where_sql}
+                AND (rn.export_claimed_by IS NULL
+                     OR rn.export_lease_expires_at <= datetime('now')
+                     OR rn.export_claimed_by = ?)
+            ORDER BY rn.created_at DESC
+            LIMIT ?
+        )
+        RETURNING id
+        """, (worker_id, f'+{int(lease_seconds)} seconds', *params, worker_id, limit)).fetchall()
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+    return [row[0] for row in rows]
+
+
+def get_notes_for_export(db_path, note_id=None, worker_id=None,
+                         lease_seconds=EXPORT_LEASE_SECONDS, limit=EXPORT_BATCH_SIZE,
+                         exclude_ids=None, backfill_target=None):
     """Query database for notes ready to export
 
+    Batch mode picks up notes with exported_to_obsidian = 0, the flag the TS
+    exporter sets too; targets that already hold a note are skipped by
+    export_notes() via exported_targets.
+
     Args:
         db_path: Path to SQLite database
         note_id: Optional - if provided, export only this specific note (raw_notes.id)
+        worker_id: Optional - claim the notes under an expiring lease for
+            this worker (requires migration 022); notes leased to another
+            live worker are skipped
+        lease_seconds: How long a claim stays valid before others may take it
+        limit: Batch size in batch mode
+        exclude_ids: Optional - raw_notes ids to leave alone in batch mode
+            (neither claimed nor returned)
+        backfill_target: Optional - instead of pending notes, pick notes
+            already exported that this target name has no obsidian_exports
+            row for (a newly added target)
     """
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
+    per_target = table_exists(conn, 'obsidian_exports')
+    select_sql = export_select_sql(per_target)
+
     if note_id:
         # Export specific note by ID
-        query = """
-        SELECT
-            rn.id, rn.title, rn.content, rn.created_at, rn.tags, rn.word_count,
-            pn.concepts, pn.primary_theme, pn.secondary_themes,
-            pn.overall_sentiment, pn.sentiment_score, pn.emotional_tone,
-            pn.energy_level, pn.sentiment_data
-        FROM raw_notes rn
-        JOIN processed_notes pn ON rn.id = pn.raw_note_id
-        WHERE rn.id = ?
+        where_sql = """rn.id = ?
+            AND rn.status = 'processed'
+            AND pn.sentiment_analyzed = 1"""
+        params = (note_id,)
+    elif backfill_target:
+        # Bring a newly added target up to date (--backfill-target)
+        where_sql = """rn.exported_to_obsidian = 1
             AND rn.status = 'processed'
             AND pn.sentiment_analyzed = 1
-        """
-        cursor.execute(query, (note_id,))
+            AND NOT EXISTS (SELECT 1 FROM obsidian_exports oe
+                            WHERE oe.raw_note_id = rn.id
+                              AND oe.target = ?)"""
+        params = (backfill_target,)
     else:
         # Export all pending notes (batch mode)
-        query = """
-        SELECT
-            rn.id, rn.title, rn.content, rn.created_at, rn.tags, rn.word_count,
-            pn.concepts, pn.primary_theme, pn.secondary_themes,
-            pn.overall_sentiment, pn.sentiment_score, pn.emotional_tone,
-            pn.energy_level, pn.sentiment_data
-        FROM raw_notes rn
-        JOIN processed_notes pn ON rn.id = pn.raw_note_id
-        WHERE rn.exported_to_obsidian = 0
+        where_sql = """rn.exported_to_obsidian = 0
             AND rn.status = 'processed'
-            AND pn.sentiment_analyzed = 1
+            AND pn.sentiment_analyzed = 1"""
+        params = ()
+
+    if exclude_ids and not note_id:
+        where_sql = f"""{where_sql}
+            AND rn.id NOT IN (SELECT value FROM json_each(?))"""
+        params = (*params, json.dumps(sorted(exclude_ids)))
+
+    if worker_id and column_exists(conn, 'raw_notes', 'export_claimed_by'):
+        # Claim first, then read only what this worker now owns
+        claimed_ids = claim_notes_for_export(conn, where_sql, params, worker_id, lease_seconds, limit)
+        if not claimed_ids:
+            conn.close()
+            return []
+        placeholders = ', '.join('?' for _ in claimed_ids)
+        where_sql = f"rn.id IN ({placeholders})"
+        params = tuple(claimed_ids)
+
+    query = f"""
+        {select_sql}
+        WHERE {where_sql}
         ORDER BY rn.created_at DESC
-        LIMIT 50
+        LIMIT ?
         """
-        cursor.execute(query)
+    cursor.execute(query, (*params, limit))
 
     notes = [dict(row) for row in cursor.fetchall()]
     conn.close()
 
+    for note in notes:
+        exported = note.pop('exported_targets', None)
+        note['exported_targets'] = set(exported.split('\x1f')) if exported else set()
+
     return notes
 
 
+def fts_match_query(conn, note, max_terms=FTS_QUERY_TERMS):
+    """Build an FTS5 MATCH expression from a note's most distinctive words
+
+    Words are weighted by how often the note uses them times their inverse
+    document frequency, so words shared by much of the corpus don't drown
+    out the ones that identify the topic. Document frequencies are counted
+    with an early-exit LIMIT: past the cutoff a word is just "common", and
+    walking its full posting list would cost more than the search itself.
+    """
+    words = re.findall(r'[a-z0-9]{4,}', f"{note['title']} {note['content']}".lower())
+    counts = {}
+    for word in words:
+        if word not in FTS_STOPWORDS and not word.isdigit():
+            counts[word] = counts.get(word, 0) + 1
+    if not counts:
+        return None
+
+    # max(id) is an O(log n) stand-in for the note count
+    total_docs = conn.execute("SELECT MAX(id) FROM raw_notes").fetchone()[0] or 1
+    max_doc_freq = int(max(50, total_docs * FTS_MAX_DOC_SHARE))
+
+    candidates = sorted(counts, key=lambda w: (-counts[w], -len(w)))[:max_terms * 2]
+    doc_freq = {}
+    for word in candidates:
+        doc_freq[word] = conn.execute("""
+        SELECT COUNT(*) FROM (
+            SELECT rowid FROM raw_notes_fts WHERE raw_notes_fts MATCH ? LIMIT ?
+        )
+        """, (f'"{word}"', max_doc_freq + 1)).fetchone()[0]
+
+    def weight(word):
+        return counts[word] * math.log(1 + total_docs / (1 + doc_freq[word]))
+
+    ranked = sorted(candidates, key=weight, reverse=True)
+
+    # Any distinctive word is a useful hit on its own. A note made only of
+    # common words must match its three rarest ones together, otherwise
+    # BM25 would have to score a large part of the corpus.
+    distinctive = [word for word in ranked if doc_freq[word] <= max_doc_freq]
+    if distinctive:
+        return ' OR '.join(f'"{word}"' for word in distinctive[:max_terms])
+    return ' AND '.join(f'"{word}"' for word in ranked[:3])
+
+
+def find_related_notes_bm25(conn, note, limit=RELATED_NOTES_LIMIT):
+    """Keyword-related notes ranked by BM25 over raw_notes_fts
+
+    Title matches weigh most, then tags, then body text.
+    """
+    match = fts_match_query(conn, note)
+    if not match:
+        return []
+
+    rows = conn.execute("""
+    SELECT rn.id, rn.title, rn.created_at,
+           bm25(raw_notes_fts, 3.0, 1.0, 2.0) AS score
+    FROM raw_notes_fts
+    JOIN raw_notes rn ON rn.id = raw_notes_fts.rowid
+    WHERE raw_notes_fts MATCH ?
+        AND raw_notes_fts.rowid != ?
+        AND rn.status = 'processed'
+    ORDER BY score
+    LIMIT ?
+    """, (match, note['id'], limit)).fetchall()
+
+    return [{'id': row[0], 'title': row[1], 'created_at': row[2], 'source': 'keyword'} for row in rows]
+
+
+def find_related_notes_by_embedding(conn, note_id, limit=RELATED_NOTES_LIMIT):
+    """Related notes from precomputed embedding similarity (note_associations)"""
+    rows = conn.execute("""
+    SELECT rn.id, rn.title, rn.created_at
+    FROM note_associations na
+    JOIN raw_notes rn ON rn.id = CASE WHEN na.note_a_id = ? THEN na.note_b_id ELSE na.note_a_id END
+    WHERE (na.note_a_id = ? OR na.note_b_id = ?)
+        AND rn.status = 'processed'
+    ORDER BY na.similarity_score DESC
+    LIMIT ?
+    """, (note_id, note_id, note_id, limit)).fetchall()
+
+    return [{'id': row[0], 'title': row[1], 'created_at': row[2], 'source': 'embedding'} for row in rows]
+
+
+def notes_held_by_targets(conn, schema, note_ids, targets):
+    """Which targets hold each note in their vault
+
+    Same rule as concept_hub_members: the target has exported the note (or
+    every target has, before per-target tracking) and its filter accepts it.
+    obsidian_exports alone isn't enough, since filtered-out notes are
+    recorded there too.
+
+    Returns:
+        {raw_note_id: set of target names}
+    """
+    if not note_ids:
+        return {}
+
+    per_target = 'obsidian_exports' in schema
+    exported_targets_column = """(SELECT group_concat(oe.target, char(31))
+                FROM obsidian_exports oe
+                WHERE oe.raw_note_id = rn.id)""" if per_target else 'NULL'
+    rows = conn.execute(f"""
+    SELECT rn.id, rn.exported_to_obsidian, pn.primary_theme, pn.energy_level, pn.concepts,
+           {exported_targets_column}
+    FROM raw_notes rn
+    JOIN processed_notes pn ON pn.raw_note_id = rn.id
+    WHERE rn.id IN (SELECT value FROM json_each(?))
+    """, (json.dumps(sorted(note_ids)),)).fetchall()
+
+    all_names = {target['name'] for target in targets}
+    held = {}
+    for note_id, exported_to_obsidian, theme, energy, concepts, exported in rows:
+        if per_target:
+            exported = set(exported.split('\x1f')) if exported else set()
+        else:
+            exported = all_names if exported_to_obsidian else set()
+        data = {'theme': theme, 'energy': energy, 'concepts': parse_json_field(concepts)}
+        held[note_id] = {
+            target['name'] for target in targets
+            if target['name'] in exported and note_matches_target(data, target)
+        }
+    return held
+
+
+def attach_related_notes(conn, schema, notes, targets, limit=RELATED_NOTES_LIMIT):
+    """Set note['related_notes'] to {target name: related notes} for each note
+
+    Embedded notes use their similarity links; notes without an embedding
+    (or without any links yet) fall back to BM25 keyword search when the
+    raw_notes_fts index exists. Each target only gets notes it already
+    holds, so links never point at a note the vault doesn't have.
+    """
+    has_embeddings = 'note_embeddings' in schema and 'note_associations' in schema
+    has_fts = 'raw_notes_fts' in schema
+
+    fetch = limit * RELATED_NOTES_OVERFETCH
+    candidates = {}
+    for note in notes:
+        related = []
+        if has_embeddings:
+            embedded = conn.execute(
+                "SELECT 1 FROM note_embeddings WHERE raw_note_id = ?", (note['id'],)
+            ).fetchone()
+            if embedded:
+                related = find_related_notes_by_embedding(conn, note['id'], fetch)
+        if not related and has_fts:
+            related = find_related_notes_bm25(conn, note, fetch)
+        candidates[note['id']] = related
+
+    held = notes_held_by_targets(
+        conn, schema, {r['id'] for related in candidates.values() for r in related}, targets
+    )
+
+    for note in notes:
+        note['related_notes'] = {
+            target['name']: [
+                r for r in candidates[note['id']] if target['name'] in held.get(r['id'], ())
+            ][:limit]
+            for target in targets
+        }
+    return notes
+
+
+def with_related_notes(markdown_data, related_notes):
+    """markdown_data with the Related Notes section filled in for one target
+
+    Notes are rendered once with the placeholder there; each target then
+    swaps in links to the related notes it holds.
+    """
+    if not related_notes:
+        return markdown_data
+
+    section = f"{RELATED_NOTES_HEADING}\n\n{RELATED_NOTES_PLACEHOLDER}"
+    head, found, tail = markdown_data['markdown'].rpartition(section)
+    if not found:
+        return markdown_data
+
+    links = '\n'.join(
+        f"- [[{note_link_name(r['title'], r['created_at'])}|{r['title']}]]" for r in related_notes
+    )
+    return {**markdown_data, 'markdown': f"{head}{RELATED_NOTES_HEADING}\n\n{links}{tail}"}
+
+
+def note_link_name(title, created_at):
+    """Vault filename (without .md) a note is exported under"""
+    created = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+    return f"{created.strftime('%Y-%m-%d')}-{create_slug(title)}"
+
+
 def parse_json_field(field, default=None):
     """Safely parse JSON fields"""
     if not field:
         return default if default is not None else []
     try:
-        return json.loads(field)
-    except (json.JSONDecodeError, TypeError):
+        return json_loads(field)
+    except (ValueError, TypeError):
         return default if default is not None else []
 
 
+def note_sentiment(note, loads=None):
+    """ADHD markers, stress flag, confidence and key emotions from sentiment_fields
+
+    Values are passed through as the LLM wrote them, so the badges and tags
+    test them for truthiness and the frontmatter prints them as-is, matching
+    the TS exporter (`sentimentData.stress_indicators || false`).
+
+    Args:
+        loads: JSON decoder to use (defaults to json_loads)
+
+    Returns:
+        (adhd_markers, stress_indicators, analysis_confidence, key_emotions)
+    """
+    adhd_markers, stress, confidence, key_emotions = (loads or json_loads)(note['sentiment_fields'])
+    if not isinstance(adhd_markers, dict):
+        adhd_markers = {}
+    if not note['has_stress_indicators']:
+        stress = False
+    if not isinstance(confidence, (int, float)):
+        confidence = 0.5
+    if isinstance(key_emotions, str):
+        key_emotions = parse_json_field(key_emotions)
+    if not isinstance(key_emotions, list):
+        key_emotions = []
+    return adhd_markers, stress, confidence, key_emotions
+
+
 def extract_action_items(content):
     """Extract TODO items from note content"""
     action_items = []
@@ -105,16 +624,9 @@ def generate_adhd_markdown(note):
     concepts = parse_json_field(note['concepts'])
     secondary_themes = parse_json_field(note['secondary_themes'])
     tags = parse_json_field(note['tags'])
-    sentiment_data = parse_json_field(note['sentiment_data'], {
-        'adhd_markers': {},
-        'key_emotions': [],
-        'stress_indicators': False
-    })
 
     # Extract ADHD markers
-    adhd_markers = sentiment_data.get('adhd_markers', {})
-    key_emotions = sentiment_data.get('key_emotions', [])
-    stress_indicators = sentiment_data.get('stress_indicators', False)
+    adhd_markers, stress_indicators, analysis_confidence, key_emotions = note_sentiment(note)
 
     # Parse date
     created_at = datetime.fromisoformat(note['created_at'].replace('Z', '+00:00'))
@@ -270,10 +782,13 @@ automated: true
 
     # Build action items section
     action_items_section = ''
+    completed_items = note.get('completed_action_items') or set()
     if action_items:
-        action_items_list = '\n'.join(f'- [ ] {item}' for item in action_items)
+        action_items_list = '\n'.join(
+            f"- [{'x' if item in completed_items else ' '}] {item}" for item in action_items
+        )
         action_items_section = f"""
-## ✅ Action Items Detected
+{ACTION_ITEMS_HEADING}
 
 {action_items_list}
 
@@ -336,8 +851,7 @@ automated: true
 
 ---"""
 
-    # Metadata footer
-    analysis_confidence = sentiment_data.get('analysis_confidence', 0.5)
+    # Metadata footer (related notes are filled in per target, see with_related_notes)
     metadata_footer = f"""
 ## 📊 Processing Metadata
 
@@ -347,9 +861,9 @@ automated: true
 - **Word Count**: {note['word_count']}
 - **Sentiment Confidence**: {round(analysis_confidence * 100)}%
 
-## 🔗 Related Notes
+{RELATED_NOTES_HEADING}
 
-*Obsidian will automatically show backlinks here based on shared concepts and tags*
+{RELATED_NOTES_PLACEHOLDER}
 
 ---
 
@@ -377,9 +891,15 @@ automated: true
         'year': year,
         'month': month,
         'concepts': concepts,
+        'tags': tags,
+        'secondary_themes': secondary_themes,
+        'adhd_markers': adhd_markers,
+        'stress_indicators': stress_indicators,
         'theme': note['primary_theme'],
         'energy': note['energy_level'],
-        'title': note['title']
+        'title': note['title'],
+        'action_items': action_items,
+        'checked_items': [item for item in action_items if item in completed_items]
     }
 
 
@@ -391,8 +911,13 @@ def create_slug(title):
     return slug[:50]
 
 
-def write_note_to_vault(note, markdown_data, vault_path):
-    """Write note to multiple locations in vault"""
+def write_note_to_vault(note, markdown_data, vault_path, layouts=VAULT_LAYOUTS, written_paths=None):
+    """Write note to multiple locations in vault
+
+    Args:
+        layouts: Which of VAULT_LAYOUTS to write into (defaults to all of them)
+        written_paths: Optional list that receives the note file paths written
+    """
 
     title_slug = create_slug(note['title'])
     filename = f"{markdown_data['date_str']}-{title_slug}.md"
@@ -404,12 +929,15 @@ def write_note_to_vault(note, markdown_data, vault_path):
         'theme': f"{vault_path}/Selene/By-Theme/{markdown_data['theme']}/{filename}",
         'energy': f"{vault_path}/Selene/By-Energy/{markdown_data['energy']}/{filename}"
     }
+    paths = {path_type: file_path for path_type, file_path in paths.items() if path_type in layouts}
 
     # Create directories and write files
     for path_type, file_path in paths.items():
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(markdown_data['markdown'])
+        if written_paths is not None:
+            written_paths.append(file_path)
 
     # Create concept hub pages
     concepts_dir = f"{vault_path}/Selene/Concepts"
@@ -430,7 +958,9 @@ This is a hub page for all notes related to **{concept}**. Obsidian will automat
 
 ## 📚 Related Notes
 
+{CONCEPT_NOTES_START}
 *Backlinks will appear here automatically*
+{CONCEPT_NOTES_END}
 
 ## 🧠 ADHD Tips
 
@@ -442,42 +972,695 @@ This is a hub page for all notes related to **{concept}**. Obsidian will automat
 
 *Auto-generated by Selene - edit freely!*
 """
-            with open(concept_file, 'w', encoding='utf-8') as f:
-                f.write(concept_content)
+            # Exclusive create: another exporter may have made (and filled) it meanwhile
+            try:
+                with open(concept_file, 'x', encoding='utf-8') as f:
+                    f.write(concept_content)
+            except FileExistsError:
+                pass
 
     return filename
 
 
-def mark_as_exported(db_path, note_id):
-    """Update database to mark note as exported"""
-    conn = sqlite3.connect(db_path)
+def concept_hub_members(conn, schema, concepts, target):
+    """Exported notes per concept for a target, newest first
+
+    One indexed query over note_concepts. Only notes the target actually
+    holds are returned, so hub links never dangle.
+
+    Returns:
+        {concept: [(title, created_at), ...]}
+    """
+    concepts = list(concepts)
+    conditions = [
+        f"nc.concept IN ({', '.join('?' for _ in concepts)})",
+        "rn.status = 'processed'"
+    ]
+    params = list(concepts)
+
+    if 'obsidian_exports' in schema:
+        conditions.append("""EXISTS (SELECT 1 FROM obsidian_exports oe
+                     WHERE oe.raw_note_id = rn.id AND oe.target = ?)""")
+        params.append(target['name'])
+    else:
+        conditions.append("rn.exported_to_obsidian = 1")
+
+    # Same filter the target applies when writing notes
+    note_filter = target.get('filter') or {}
+    if note_filter.get('themes'):
+        conditions.append(f"pn.primary_theme IN ({', '.join('?' for _ in note_filter['themes'])})")
+        params.extend(note_filter['themes'])
+    if note_filter.get('energy'):
+        conditions.append(f"pn.energy_level IN ({', '.join('?' for _ in note_filter['energy'])})")
+        params.extend(note_filter['energy'])
+    if note_filter.get('concepts'):
+        conditions.append(f"""EXISTS (SELECT 1 FROM note_concepts fc
+                     WHERE fc.raw_note_id = rn.id
+                       AND fc.concept IN ({', '.join('?' for _ in note_filter['concepts'])}))""")
+        params.extend(note_filter['concepts'])
+
+    rows = conn.execute(f"""
+    SELECT nc.concept, rn.title, rn.created_at
+    FROM note_concepts nc
+    JOIN raw_notes rn ON rn.id = nc.raw_note_id
+    JOIN processed_notes pn ON pn.id = nc.processed_note_id
+    WHERE {' AND '.join(conditions)}
+    ORDER BY nc.concept, rn.created_at DESC
+    """, params).fetchall()
+
+    members = {concept: [] for concept in concepts}
+    for concept, title, created_at in rows:
+        members[concept].append((title, created_at))
+    return members
+
+
+def render_concept_notes(members):
+    """Markdown for the generated member list of a concept hub page"""
+    if not members:
+        return '*No exported notes yet*'
+
+    latest = members[0][1][:10]
+    lines = [f"**{len(members)} note{'s' if len(members) != 1 else ''}** · latest {latest}", '']
+    for title, created_at in members[:CONCEPT_HUB_MAX_NOTES]:
+        lines.append(f"- [[{note_link_name(title, created_at)}|{title}]] ({created_at[:10]})")
+    if len(members) > CONCEPT_HUB_MAX_NOTES:
+        lines.append(f"- *...and {len(members) - CONCEPT_HUB_MAX_NOTES} older notes*")
+    return '\n'.join(lines)
+
+
+@contextmanager
+def vault_lock(vault_path, lock_dir=None):
+    """Hold the exclusive lock for read-modify-write of a vault's shared files
+
+    Concept hub pages and the mobile bundle are rewritten by whichever
+    exporter touches them, so concurrent exporters (--workers, webhook
+    calls) serialise on this flock. The lock file lives outside the vault
+    (next to the DB when export_notes passes lock_dir, else the temp dir)
+    so it never syncs to other devices; it is named after the vault path.
+
+    Args:
+        lock_dir: Directory for the lock file, shared by every exporter
+    """
+    vault_key = hashlib.sha1(os.path.realpath(vault_path).encode('utf-8')).hexdigest()[:16]
+    lock_path = os.path.join(lock_dir or tempfile.gettempdir(), f".selene-vault-{vault_key}.lock")
+    with open(lock_path, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def update_concept_hubs(conn, schema, target, concepts, lock_dir=None):
+    """Refresh member lists on a target's concept hub pages
+
+    Only the block between the selene:concept-notes markers is rewritten,
+    so edits elsewhere on the page survive. Hubs from before the markers
+    existed get the block in place of their backlinks placeholder.
+    Members are read under the vault lock too, so a slower exporter can't
+    overwrite a hub with a member list older than the one already there.
+    """
+    if not concepts or 'note_concepts' not in schema:
+        return
+
+    with vault_lock(target['path'], lock_dir):
+        members = concept_hub_members(conn, schema, concepts, target)
+        write_concept_hubs(target, members)
+
+
+def write_concept_hubs(target, members):
+    """Splice fresh member lists into existing hub pages (caller holds vault_lock)"""
+    concepts_dir = f"{target['path']}/Selene/Concepts"
+    for concept, concept_members in members.items():
+        concept_file = f"{concepts_dir}/{concept}.md"
+        if not os.path.exists(concept_file):
+            continue
+
+        with open(concept_file, 'r', encoding='utf-8') as f:
+            page = f.read()
+
+        block = f"{CONCEPT_NOTES_START}\n{render_concept_notes(concept_members)}\n{CONCEPT_NOTES_END}"
+        if CONCEPT_NOTES_START in page and CONCEPT_NOTES_END in page:
+            before = page[:page.index(CONCEPT_NOTES_START)]
+            after = page[page.index(CONCEPT_NOTES_END) + len(CONCEPT_NOTES_END):]
+            page = f"{before}{block}{after}"
+        elif '*Backlinks will appear here automatically*' in page:
+            page = page.replace('*Backlinks will appear here automatically*', block, 1)
+        else:
+            page = f"{page.rstrip()}\n\n## 📚 Related Notes\n\n{block}\n"
+
+        with open(concept_file, 'w', encoding='utf-8') as f:
+            f.write(page)
+
+
+def attach_completed_action_items(conn, schema, notes):
+    """Set note['completed_action_items'] so re-exports keep ticked boxes ticked"""
+    if 'note_action_items' not in schema or not notes:
+        for note in notes:
+            note['completed_action_items'] = set()
+        return notes
+
+    placeholders = ', '.join('?' for _ in notes)
+    completed = {}
+    for raw_note_id, item_text in conn.execute(f"""
+    SELECT raw_note_id, item_text
+    FROM note_action_items
+    WHERE raw_note_id IN ({placeholders})
+        AND completed_at IS NOT NULL
+    """, [note['id'] for note in notes]):
+        completed.setdefault(raw_note_id, set()).add(item_text)
+
+    for note in notes:
+        note['completed_action_items'] = completed.get(note['id'], set())
+    return notes
+
+
+def record_vault_files(conn, schema, target_name, note_id, paths, markdown_data):
+    """Record written files in the export manifest and register action items
+
+    The manifest keeps each file's mtime/size as written, which is what lets
+    --sync-actions skip every file the user hasn't touched since.
+    """
+    if 'obsidian_export_files' not in schema:
+        return
+
+    checked_items = json.dumps(markdown_data['checked_items'])
+    rows = []
+    for path in paths:
+        stat = os.stat(path)
+        rows.append((path, target_name, note_id, stat.st_mtime_ns, stat.st_size, checked_items))
+
+    with conn:
+        conn.executemany("""
+        INSERT INTO obsidian_export_files (path, target, raw_note_id, mtime_ns, size, checked_items, recorded_at)
+        VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+        ON CONFLICT(path) DO UPDATE SET
+            target = excluded.target,
+            raw_note_id = excluded.raw_note_id,
+            mtime_ns = excluded.mtime_ns,
+            size = excluded.size,
+            checked_items = excluded.checked_items,
+            recorded_at = excluded.recorded_at
+        """, rows)
+        conn.executemany("""
+        INSERT OR IGNORE INTO note_action_items (raw_note_id, item_text)
+        VALUES (?, ?)
+        """, [(note_id, item) for item in markdown_data['action_items']])
+
+
+def parse_action_items_section(markdown):
+    """Read the action-items section of an exported note
+
+    Returns:
+        {item_text: checked} for the checkbox lines under ACTION_ITEMS_HEADING
+    """
+    start = markdown.find(ACTION_ITEMS_HEADING)
+    if start == -1:
+        return {}
+
+    items = {}
+    for line in markdown[start + len(ACTION_ITEMS_HEADING):].splitlines():
+        if line.startswith('## ') or line.strip() == '---':
+            break
+        match = ACTION_ITEM_LINE.match(line)
+        if match:
+            items[match.group(2)] = match.group(1) != ' '
+    return items
+
+
+def sync_action_items(db_path):
+    """Apply action items ticked or unticked in Obsidian back to the DB
+
+    Only manifest files whose mtime or size changed since the last export
+    or scan are read, so a scan costs about one stat per exported file plus
+    one parse per edited file. Each changed file is compared with the
+    checked state recorded for that same file, so a stale copy of a note
+    in another layout folder can't undo a completion made elsewhere.
+    Everything is applied in one transaction.
+
+    Returns:
+        Dict of scan statistics
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    if not table_exists(conn, 'obsidian_export_files'):
+        conn.close()
+        raise RuntimeError('Export manifest missing - run database/migrations/025_vault_action_items.sql')
+
+    stats = {'files': 0, 'changed': 0, 'missing': 0, 'completed': 0, 'reopened': 0}
+    manifest_updates = []
+    transitions = {}  # (raw_note_id, item) -> (checked, mtime_ns)
+
+    for path, raw_note_id, mtime_ns, size, checked_json in conn.execute(
+        "SELECT path, raw_note_id, mtime_ns, size, checked_items FROM obsidian_export_files"
+    ).fetchall():
+        stats['files'] += 1
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stats['missing'] += 1
+            continue
+        if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+            continue
+
+        stats['changed'] += 1
+        with open(path, 'r', encoding='utf-8') as f:
+            items = parse_action_items_section(f.read())
+
+        previously_checked = set(parse_json_field(checked_json))
+        now_checked = {item for item, checked in items.items() if checked}
+        for item in now_checked - previously_checked:
+            key = (raw_note_id, item)
+            if key not in transitions or transitions[key][1] < stat.st_mtime_ns:
+                transitions[key] = (True, stat.st_mtime_ns)
+        for item in previously_checked - now_checked:
+            key = (raw_note_id, item)
+            if key not in transitions or transitions[key][1] < stat.st_mtime_ns:
+                transitions[key] = (False, stat.st_mtime_ns)
+
+        manifest_updates.append((stat.st_mtime_ns, stat.st_size, json.dumps(sorted(now_checked)), path))
+
+    has_activity = table_exists(conn, 'thread_activity')
+    with conn:
+        for (raw_note_id, item), (checked, _) in transitions.items():
+            if checked:
+                conn.execute("""
+                INSERT OR IGNORE INTO note_action_items (raw_note_id, item_text) VALUES (?, ?)
+                """, (raw_note_id, item))
+                updated = conn.execute("""
+                UPDATE note_action_items
+                SET completed_at = datetime('now')
+                WHERE raw_note_id = ? AND item_text = ? AND completed_at IS NULL
+                """, (raw_note_id, item)).rowcount
+                stats['completed'] += updated
+                if updated and has_activity:
+                    # Completions feed thread momentum (reconsolidate-threads.ts)
+                    conn.execute("""
+                    INSERT INTO thread_activity (thread_id, activity_type)
+                    SELECT thread_id, 'task_completed' FROM thread_notes WHERE raw_note_id = ?
+                    """, (raw_note_id,))
+            else:
+                stats['reopened'] += conn.execute("""
+                UPDATE note_action_items
+                SET completed_at = NULL
+                WHERE raw_note_id = ? AND item_text = ? AND completed_at IS NOT NULL
+                """, (raw_note_id, item)).rowcount
+
+        conn.executemany("""
+        UPDATE obsidian_export_files
+        SET mtime_ns = ?, size = ?, checked_items = ?, recorded_at = datetime('now')
+        WHERE path = ?
+        """, manifest_updates)
+
+    conn.close()
+    return stats
+
+
+def attach_thread_ids(conn, schema, notes):
+    """Set note['thread_ids'] for the mobile bundle"""
+    for note in notes:
+        note['thread_ids'] = []
+    if notes and 'thread_notes' in schema:
+        by_id = {note['id']: note for note in notes}
+        placeholders = ', '.join('?' for _ in notes)
+        for raw_note_id, thread_id in conn.execute(f"""
+        SELECT raw_note_id, thread_id
+        FROM thread_notes
+        WHERE raw_note_id IN ({placeholders})
+        ORDER BY thread_id
+        """, list(by_id)):
+            by_id[raw_note_id]['thread_ids'].append(thread_id)
+    return notes
+
+
+def mobile_bundle_record(note, markdown_data, vault_path, written_paths):
+    """Plain-data view of a note for the mobile bundle (no markdown)
+
+    JSON columns come already decoded from generate_adhd_markdown's result.
+    """
+    return {
+        'id': note['id'],
+        'title': note['title'],
+        'created_at': note['created_at'],
+        'content': note['content'],
+        'word_count': note['word_count'],
+        'tags': markdown_data['tags'],
+        'theme': note['primary_theme'],
+        'secondary_themes': markdown_data['secondary_themes'],
+        'concepts': markdown_data['concepts'],
+        'energy': note['energy_level'],
+        'sentiment': {
+            'overall': note['overall_sentiment'],
+            'score': note['sentiment_score'],
+            'tone': note['emotional_tone'],
+            'stress': bool(markdown_data['stress_indicators']),
+            'adhd_markers': markdown_data['adhd_markers'],
+        },
+        'thread_ids': note.get('thread_ids', []),
+        'action_items': markdown_data['action_items'],
+        'checked_items': markdown_data['checked_items'],
+        'paths': [os.path.relpath(path, vault_path) for path in written_paths],
+    }
+
+
+def read_mobile_bundle_index(f):
+    """Read a bundle's index
+
+    Returns:
+        ({raw_note_id: (offset, length)}, end of the index) or None when the
+        file is empty or not a bundle
+    """
+    f.seek(0)
+    header = f.read(MOBILE_BUNDLE_HEADER.size)
+    if len(header) < MOBILE_BUNDLE_HEADER.size:
+        return None
+    magic, version, _, count, index_offset = MOBILE_BUNDLE_HEADER.unpack(header)
+    if magic != MOBILE_BUNDLE_MAGIC or version != MOBILE_BUNDLE_VERSION:
+        return None
+
+    f.seek(index_offset)
+    data = f.read(count * MOBILE_BUNDLE_INDEX_ENTRY.size)
+    entries = {
+        note_id: (offset, length)
+        for note_id, offset, length in MOBILE_BUNDLE_INDEX_ENTRY.iter_unpack(data)
+    }
+    return entries, index_offset + len(data)
+
+
+def read_mobile_bundle_record(bundle_path, note_id):
+    """Random-access one note from a bundle (None if it isn't there)"""
+    with open(bundle_path, 'rb') as f:
+        index = read_mobile_bundle_index(f)
+        if not index or note_id not in index[0]:
+            return None
+        offset, length = index[0][note_id]
+        f.seek(offset + MOBILE_BUNDLE_LENGTH.size)
+        return json.loads(f.read(length).decode('utf-8'))
+
+
+def write_mobile_bundle_index(f, entries, index_offset):
+    """Write the sorted index at index_offset, then point the header at it"""
+    f.seek(index_offset)
+    f.write(b''.join(
+        MOBILE_BUNDLE_INDEX_ENTRY.pack(note_id, offset, length)
+        for note_id, (offset, length) in sorted(entries.items())
+    ))
+    f.truncate()
+    f.flush()
+    os.fsync(f.fileno())
+    f.seek(0)
+    f.write(MOBILE_BUNDLE_HEADER.pack(MOBILE_BUNDLE_MAGIC, MOBILE_BUNDLE_VERSION, 0, len(entries), index_offset))
+    f.flush()
+
+
+def compact_mobile_bundle(f, entries, bundle_path):
+    """Copy live records into a fresh bundle and swap it in"""
+    tmp_path = bundle_path + '.tmp'
+    compacted = {}
+    with open(tmp_path, 'wb') as out:
+        out.write(b'\0' * MOBILE_BUNDLE_HEADER.size)
+        for note_id, (offset, length) in sorted(entries.items()):
+            f.seek(offset)
+            compacted[note_id] = (out.tell(), length)
+            out.write(f.read(MOBILE_BUNDLE_LENGTH.size + length))
+        write_mobile_bundle_index(out, compacted, out.tell())
+    os.replace(tmp_path, bundle_path)
+
+
+def update_mobile_bundle(vault_path, records, lock_dir=None):
+    """Append note records to the target's bundle and rewrite its index
+
+    Re-exported notes get a new record and the index moves to it; the old
+    copy stays as dead space until compaction. Records are appended after
+    the current index, so the file stays readable if this is interrupted.
+    vault_lock serialises concurrent exporters.
+
+    Args:
+        records: {raw_note_id: record dict}
+        lock_dir: See vault_lock
+    """
+    bundle_path = f"{vault_path}/Selene/{MOBILE_BUNDLE_FILENAME}"
+    os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+
+    with vault_lock(vault_path, lock_dir):
+        mode = 'r+b' if os.path.exists(bundle_path) else 'w+b'
+        with open(bundle_path, mode) as f:
+            index = read_mobile_bundle_index(f)
+            if index is None:
+                entries, end = {}, MOBILE_BUNDLE_HEADER.size
+                f.seek(0)
+                f.write(b'\0' * MOBILE_BUNDLE_HEADER.size)
+            else:
+                entries, end = index
+
+            f.seek(end)
+            for note_id, record in records.items():
+                data = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                entries[note_id] = (f.tell(), len(data))
+                f.write(MOBILE_BUNDLE_LENGTH.pack(len(data)) + data)
+            index_offset = f.tell()
+            write_mobile_bundle_index(f, entries, index_offset)
+
+            live_bytes = sum(MOBILE_BUNDLE_LENGTH.size + length for _, length in entries.values())
+            dead_bytes = index_offset - MOBILE_BUNDLE_HEADER.size - live_bytes
+            if dead_bytes > max(live_bytes, MOBILE_BUNDLE_COMPACT_MIN_BYTES):
+                compact_mobile_bundle(f, entries, bundle_path)
+
+    return bundle_path
+
+
+def mark_as_exported(conn, schema, note_id, target_names=None, all_targets_done=True, worker_id=None):
+    """Update database to mark note as exported
+
+    Args:
+        target_names: Vault targets the note was handled for in this run;
+            recorded in obsidian_exports when that table exists
+        all_targets_done: Whether every configured target now has the note,
+            which is when raw_notes.exported_to_obsidian gets set
+        worker_id: Release this worker's export lease on the note
+    """
     cursor = conn.cursor()
 
-    query = """
+    if target_names and 'obsidian_exports' in schema:
+        cursor.executemany("""
+        INSERT INTO obsidian_exports (raw_note_id, target, exported_at)
+        VALUES (?, ?, datetime('now'))
+        ON CONFLICT(raw_note_id, target) DO UPDATE SET exported_at = excluded.exported_at
+        """, [(note_id, name) for name in target_names])
+
+    if all_targets_done:
+        query = """
+        UPDATE raw_notes
+        SET exported_to_obsidian = 1,
+            exported_at = datetime('now')
+        WHERE id = ?
+        """
+        cursor.execute(query, (note_id,))
+
+    if worker_id:
+        release_export_claim(conn, schema, note_id, worker_id)
+
+    conn.commit()
+
+
+def release_export_claim(conn, schema, note_id, worker_id):
+    """Drop a worker's lease on a note (no-op if the lease was taken over)"""
+    if 'raw_notes.export_claimed_by' not in schema:
+        return
+
+    conn.execute("""
     UPDATE raw_notes
-    SET exported_to_obsidian = 1,
-        exported_at = datetime('now')
+    SET export_claimed_by = NULL,
+        export_lease_expires_at = NULL
     WHERE id = ?
+        AND export_claimed_by = ?
+    """, (note_id, worker_id))
+
+
+def export_notes(db_path, notes, targets, note_id=None, worker_id=None, backfill=False):
+    """Render each note once and write it to every target that needs it
+
+    The batch shares one connection, and the optional schema is probed once.
+    With backfill, the notes are already exported: only their
+    obsidian_exports rows are added, exported_to_obsidian is left alone.
+
+    Returns:
+        (exported_count, per-target written counts)
     """
+    import sys
+
+    exported_count = 0
+    target_counts = {target['name']: 0 for target in targets}
+    hub_concepts = {target['name']: set() for target in targets}
+    bundle_records = {target['name']: {} for target in targets}
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    schema = export_schema(conn)
+    attach_related_notes(conn, schema, notes, targets)
+    attach_completed_action_items(conn, schema, notes)
+    attach_thread_ids(conn, schema, notes)
+    for note in notes:
+        try:
+            # Generate markdown once for all targets
+            markdown_data = generate_adhd_markdown(note)
+
+            # Fan out to every target that still needs the note. A webhook
+            # call for a specific note re-exports it everywhere.
+            handled = []
+            failed = False
+            for target in targets:
+                if not note_id and target['name'] in note['exported_targets']:
+                    continue
+                try:
+                    if note_matches_target(markdown_data, target):
+                        written_paths = []
+                        target_data = with_related_notes(markdown_data, note['related_notes'][target['name']])
+                        write_note_to_vault(note, target_data, target['path'], target['layouts'], written_paths)
+                        record_vault_files(conn, schema, target['name'], note['id'], written_paths, markdown_data)
+                        target_counts[target['name']] += 1
+                        hub_concepts[target['name']].update(markdown_data['concepts'])
+                        if target['bundle']:
+                            bundle_records[target['name']][note['id']] = mobile_bundle_record(
+                                note, markdown_data, target['path'], written_paths
+                            )
+                    # Filtered-out notes are recorded too so they aren't re-queried
+                    handled.append(target['name'])
+                except Exception as e:
+                    failed = True
+                    print(f"Error exporting note {note['id']} to target {target['name']}: {e}", file=sys.stderr)
+
+            # Mark as exported (and release the lease)
+            mark_as_exported(conn, schema, note['id'], handled,
+                             all_targets_done=not failed and not backfill, worker_id=worker_id)
+
+            if not failed:
+                exported_count += 1
+
+        except Exception as e:
+            print(f"Error exporting note {note['id']}: {e}", file=sys.stderr)
+            if worker_id:
+                conn.rollback()
+                release_export_claim(conn, schema, note['id'], worker_id)
+                conn.commit()
+            continue
+
+    # Concept hubs list their notes once the batch is marked exported.
+    # Every exporter shares the DB, so its directory holds the vault locks.
+    lock_dir = os.path.dirname(os.path.abspath(db_path))
+    for target in targets:
+        try:
+            update_concept_hubs(conn, schema, target, hub_concepts[target['name']], lock_dir)
+        except Exception as e:
+            print(f"Error updating concept hubs for target {target['name']}: {e}", file=sys.stderr)
+        if bundle_records[target['name']]:
+            try:
+                update_mobile_bundle(target['path'], bundle_records[target['name']], lock_dir)
+            except Exception as e:
+                print(f"Error updating mobile bundle for target {target['name']}: {e}", file=sys.stderr)
 
-    cursor.execute(query, (note_id,))
-    conn.commit()
     conn.close()
+    return exported_count, target_counts
 
 
-def main():
-    """Main export function"""
+def run_export_worker(db_path, targets, worker_id=None, drain=True, backfill_target=None):
+    """Claim and export batches until nothing claimable is left
+
+    Several of these can run at once (separate processes or machines
+    sharing the DB); leases keep their batches disjoint.
+
+    With backfill_target, targets should hold just that target; notes
+    already exported elsewhere are written to it (see get_notes_for_export).
+
+    Returns:
+        (exported_count, per-target written counts)
+    """
+    worker_id = worker_id or default_worker_id()
+    exported_count = 0
+    target_counts = {target['name']: 0 for target in targets}
+
+    # Notes that failed earlier in this run are still pending. They are kept
+    # out of the claim itself: claiming and then skipping them would leave
+    # them leased (blocking webhook exports) until the lease ran out.
+    attempted = set()
+    while True:
+        notes = get_notes_for_export(db_path, worker_id=worker_id, exclude_ids=attempted,
+                                     backfill_target=backfill_target)
+        if not notes:
+            break
+        attempted.update(note['id'] for note in notes)
+
+        batch_count, batch_targets = export_notes(db_path, notes, targets, worker_id=worker_id,
+                                                  backfill=bool(backfill_target))
+        exported_count += batch_count
+        for name, count in batch_targets.items():
+            target_counts[name] += count
+
+        if not drain:
+            break
+
+    return exported_count, target_counts
+
+
+def _run_export_worker_process(args):
+    """multiprocessing entry point for --workers"""
+    db_path, targets, worker_index, backfill_target = args
+    return run_export_worker(db_path, targets, f"{default_worker_id()}:{worker_index}",
+                             backfill_target=backfill_target)
+
+
+def main(targets=None):
+    """Main export function
+
+    Args:
+        targets: Optional list of vault targets (dicts with name, path,
+            layouts and filter). Defaults to load_vault_targets(). Each note
+            is queried and rendered once, then written to every target.
+
+    Usage:
+        obsidian_export.py [noteId] [--drain] [--workers N]
+        obsidian_export.py --backfill-target NAME [--drain] [--workers N]
+        obsidian_export.py --sync-actions
+
+    Notes are claimed under expiring leases, so concurrent runs (cron batch,
+    webhook call, --workers) never export the same note twice.
+    """
+    import argparse
     import sys
+    from multiprocessing import Pool
+
+    parser = argparse.ArgumentParser(description='Export processed notes to Obsidian')
+    parser.add_argument('note_id', nargs='?', help='Export only this raw_notes id (event-driven webhook calls)')
+    parser.add_argument('--drain', action='store_true', help='Keep claiming batches until the backlog is empty')
+    parser.add_argument('--workers', type=int, default=1, help='Number of exporter processes sharing the backlog (implies --drain)')
+    parser.add_argument('--backfill-target', metavar='NAME',
+                        help='Write notes already exported to this (newly added) target only')
+    parser.add_argument('--sync-actions', action='store_true', help='Read action items ticked in Obsidian back into the DB')
+    args = parser.parse_args()
 
     # Configuration
-    db_path = '/selene/data/selene.db'
-    vault_path = os.environ.get('OBSIDIAN_VAULT_PATH', '/selene/vault')
+    db_path = os.environ.get('SELENE_DB_PATH', '/selene/data/selene.db')
+
+    if args.sync_actions:
+        stats = sync_action_items(db_path)
+        print(json.dumps({
+            'success': True,
+            'message': f"Synced {stats['changed']} changed file(s)",
+            **stats,
+            'timestamp': datetime.now().isoformat()
+        }))
+        return
+    if targets is None:
+        try:
+            targets = load_vault_targets()
+        except ValueError as e:
+            print(json.dumps({
+                'success': False,
+                'error': 'Invalid OBSIDIAN_VAULT_TARGETS',
+                'message': str(e)
+            }), file=sys.stderr)
+            sys.exit(1)
 
     # Check for noteId argument (for event-driven webhook calls)
     note_id = None
-    if len(sys.argv) > 1:
+    if args.note_id is not None:
         try:
-            note_id = int(sys.argv[1])
+            note_id = int(args.note_id)
         except ValueError:
             print(json.dumps({
                 'success': False,
@@ -486,36 +1669,73 @@ def main():
             }), file=sys.stderr)
             sys.exit(1)
 
-    # Get notes to export
-    notes = get_notes_for_export(db_path, note_id)
-
-    if not notes:
-        message = f'Note {note_id} not found or not ready for export' if note_id else 'No notes ready for export'
-        print(json.dumps({
-            'success': True,
-            'message': message,
-            'exported_count': 0
-        }))
-        return
-
-    # Export each note
-    exported_count = 0
-    for note in notes:
-        try:
-            # Generate markdown
-            markdown_data = generate_adhd_markdown(note)
+    conn = sqlite3.connect(db_path)
+    leases_available = column_exists(conn, 'raw_notes', 'export_claimed_by')
+    per_target = table_exists(conn, 'obsidian_exports')
+    conn.close()
 
-            # Write to vault
-            filename = write_note_to_vault(note, markdown_data, vault_path)
+    backfill_target = args.backfill_target
+    if backfill_target:
+        error = None
+        if note_id:
+            error = '--backfill-target cannot be combined with a noteId'
+        elif not per_target:
+            error = '--backfill-target needs migration 021_obsidian_export_targets.sql'
+        elif backfill_target not in [target['name'] for target in targets]:
+            error = f'Unknown vault target: {backfill_target}'
+        if error:
+            print(json.dumps({
+                'success': False,
+                'error': 'Invalid --backfill-target',
+                'message': error
+            }), file=sys.stderr)
+            sys.exit(1)
+        targets = [target for target in targets if target['name'] == backfill_target]
 
-            # Mark as exported
-            mark_as_exported(db_path, note['id'])
+    if args.workers > 1 and not note_id:
+        if not leases_available:
+            print(json.dumps({
+                'success': False,
+                'error': 'Export leases not available',
+                'message': '--workers needs migration 022_export_leases.sql'
+            }), file=sys.stderr)
+            sys.exit(1)
 
-            exported_count += 1
+        # Shard the backlog across processes
+        with Pool(args.workers) as pool:
+            results = pool.map(_run_export_worker_process,
+                               [(db_path, targets, index, backfill_target) for index in range(args.workers)])
 
-        except Exception as e:
-            print(f"Error exporting note {note['id']}: {e}", file=sys.stderr)
-            continue
+        exported_count = sum(count for count, _ in results)
+        target_counts = {target['name']: sum(counts[target['name']] for _, counts in results) for target in targets}
+    else:
+        worker_id = default_worker_id()
+
+        if note_id:
+            # Get notes to export
+            notes = get_notes_for_export(db_path, note_id, worker_id=worker_id)
+
+            if not notes:
+                print(json.dumps({
+                    'success': True,
+                    'message': f'Note {note_id} not found, not ready for export, or claimed by another exporter',
+                    'exported_count': 0
+                }))
+                return
+
+            # Export each note
+            exported_count, target_counts = export_notes(db_path, notes, targets, note_id, worker_id)
+        else:
+            exported_count, target_counts = run_export_worker(db_path, targets, worker_id, drain=args.drain,
+                                                              backfill_target=backfill_target)
+
+        if not exported_count and not note_id:
+            print(json.dumps({
+                'success': True,
+                'message': 'No notes ready for export',
+                'exported_count': 0
+            }))
+            return
 
     # Return success response
     mode = 'specific note' if note_id else f'{exported_count} note(s)'
@@ -523,6 +1743,7 @@ def main():
         'success': True,
         'message': f'Successfully exported {mode}',
         'exported_count': exported_count,
+        'targets': target_counts,
         'note_id': note_id,
         'timestamp': datetime.now().isoformat()
     }))
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Recompute momentum_score and emotional_charge for every active thread.
+
+Loads thread membership, note timestamps and sentiment scores into arrays,
+computes both scores for all threads at once with numpy, and writes them
+back in a single UPDATE. Meant for the nightly run; reconsolidate-threads.ts
+still refreshes momentum after each reconsolidation.
+
+momentum_score uses the same formula as reconsolidate-threads.ts:
+    notes added in the last 7 days * 2
+  + notes added in the last 30 days
+  + tasks completed in the last 7 days * 3   (thread_activity)
+
+emotional_charge is the recency-weighted mean sentiment intensity of the
+thread's notes, |sentiment_score - 0.5| * 2 (0 = neutral, 1 = strongest),
+with each note's weight halving every CHARGE_HALF_LIFE_DAYS. The latest
+sentiment_history score is used, falling back to processed_notes. Threads
+with no scored notes get NULL.
+
+Requires numpy.
+
+Usage:
+    python3 scripts/recompute-thread-scores.py
+    python3 scripts/recompute-thread-scores.py --dry-run
+    python3 scripts/recompute-thread-scores.py --db ~/selene-data-dev/selene.db
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reported by main()
+    np = None
+
+
+CHARGE_HALF_LIFE_DAYS = 14.0
+
+# Rows are joined in numpy rather than SQL: per-row joins into raw_notes
+# and sentiment_history cost more than reading each table once
+MEMBERSHIP_SQL = """
+SELECT tn.thread_id, tn.raw_note_id, julianday('now') - julianday(tn.added_at)
+FROM thread_notes tn
+JOIN threads t ON t.id = tn.thread_id
+WHERE t.status = 'active'
+"""
+
+NOTES_SQL = """
+SELECT rn.id, julianday('now') - julianday(rn.created_at), pn.sentiment_score
+FROM raw_notes rn
+LEFT JOIN processed_notes pn ON pn.raw_note_id = rn.id
+WHERE rn.id IN (SELECT raw_note_id FROM thread_notes)
+ORDER BY rn.id
+"""
+
+# Bare columns come from the MAX(id) row: the latest analysis per note
+LATEST_SENTIMENT_SQL = """
+SELECT raw_note_id, sentiment_score, MAX(id)
+FROM sentiment_history
+WHERE sentiment_score IS NOT NULL
+GROUP BY raw_note_id
+"""
+
+TASKS_SQL = """
+SELECT thread_id, COUNT(*)
+FROM thread_activity
+WHERE activity_type = 'task_completed'
+    AND julianday(occurred_at) >= julianday('now', '-7 days')
+GROUP BY thread_id
+"""
+
+BULK_UPDATE_SQL = """
+UPDATE threads
+SET momentum_score = json_extract(s.value, '$[1]'),
+    emotional_charge = json_extract(s.value, '$[2]')
+FROM json_each(?) s
+WHERE threads.id = json_extract(s.value, '$[0]')
+"""
+
+
+def table_exists(conn, table_name):
+    row = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+    ).fetchone()
+    return row[0] > 0
+
+
+def lookup(sorted_keys, keys):
+    """Positions of keys in sorted_keys, plus a mask of which were found"""
+    if not len(sorted_keys):
+        return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+    pos = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return pos, sorted_keys[pos] == keys
+
+
+def load_arrays(conn):
+    """Read everything the scores depend on, one query per table
+
+    Returns:
+        Dict of arrays: thread_ids (sorted active threads), member_thread /
+        member_added_age (one entry per thread_notes row, thread as a
+        position in thread_ids), member_note_age / member_score (NULL -> nan)
+        and task_counts (aligned with thread_ids)
+    """
+    thread_ids = np.array(
+        [row[0] for row in conn.execute("SELECT id FROM threads WHERE status = 'active' ORDER BY id")],
+        dtype=np.int64,
+    )
+    membership = np.array(conn.execute(MEMBERSHIP_SQL).fetchall(), dtype=np.float64).reshape(-1, 3)
+    notes = np.array(conn.execute(NOTES_SQL).fetchall(), dtype=np.float64).reshape(-1, 3)
+    note_ids = notes[:, 0].astype(np.int64)
+    note_scores = notes[:, 2]
+
+    # sentiment_history wins over processed_notes where a note has both
+    latest = np.array(conn.execute(LATEST_SENTIMENT_SQL).fetchall(), dtype=np.float64).reshape(-1, 3)
+    pos, found = lookup(note_ids, latest[:, 0].astype(np.int64))
+    note_scores[pos[found]] = latest[found, 1]
+
+    member_thread, _ = lookup(thread_ids, membership[:, 0].astype(np.int64))
+    member_note, found = lookup(note_ids, membership[:, 1].astype(np.int64))
+    member_note_age = np.full(len(membership), np.nan)
+    member_score = np.full(len(membership), np.nan)
+    member_note_age[found] = notes[member_note[found], 1]
+    member_score[found] = note_scores[member_note[found]]
+
+    task_counts = np.zeros(len(thread_ids))
+    if table_exists(conn, 'thread_activity') and len(thread_ids):
+        rows = np.array(conn.execute(TASKS_SQL).fetchall(), dtype=np.int64).reshape(-1, 2)
+        pos, found = lookup(thread_ids, rows[:, 0])
+        task_counts[pos[found]] = rows[found, 1]
+
+    return {
+        'thread_ids': thread_ids,
+        'member_thread': member_thread,
+        'member_added_age': membership[:, 2],
+        'member_note_age': member_note_age,
+        'member_score': member_score,
+        'task_counts': task_counts,
+    }
+
+
+def compute_scores(arrays, half_life_days=CHARGE_HALF_LIFE_DAYS):
+    """Momentum and emotional charge for every thread in one pass
+
+    Returns:
+        (momentum, charge) arrays aligned with arrays['thread_ids']; charge
+        is nan for threads without any scored note
+    """
+    count = len(arrays['thread_ids'])
+    thread = arrays['member_thread']
+    added_age = arrays['member_added_age']
+    note_age = arrays['member_note_age']
+    score = arrays['member_score']
+
+    # nan ages (unparseable timestamps) compare False and drop out of both windows
+    notes_7_days = np.bincount(thread, weights=added_age <= 7, minlength=count)
+    notes_30_days = np.bincount(thread, weights=added_age <= 30, minlength=count)
+    momentum = notes_7_days * 2 + notes_30_days + arrays['task_counts'] * 3
+
+    scored = ~np.isnan(score) & ~np.isnan(note_age)
+    weight = 0.5 ** (np.maximum(note_age[scored], 0) / half_life_days)
+    intensity = np.clip(np.abs(score[scored] - 0.5) * 2, 0, 1)
+    weight_sum = np.bincount(thread[scored], weights=weight, minlength=count)
+    charge_sum = np.bincount(thread[scored], weights=weight * intensity, minlength=count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        charge = np.where(weight_sum > 0, charge_sum / weight_sum, np.nan)
+
+    return momentum, charge
+
+
+def write_scores(conn, thread_ids, momentum, charge):
+    """One UPDATE ... FROM json_each for all threads"""
+    payload = json.dumps([
+        [int(thread_id), float(m), None if np.isnan(c) else round(float(c), 4)]
+        for thread_id, m, c in zip(thread_ids, momentum, charge)
+    ])
+    with conn:
+        return conn.execute(BULK_UPDATE_SQL, (payload,)).rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute thread momentum and emotional charge")
+    parser.add_argument("--db", default=os.environ.get("SELENE_DB_PATH", "/selene/data/selene.db"))
+    parser.add_argument("--dry-run", action="store_true", help="Compute and report, don't write")
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit("numpy is required: pip3 install numpy")
+
+    conn = sqlite3.connect(os.path.expanduser(args.db), timeout=30)
+
+    started = time.perf_counter()
+    arrays = load_arrays(conn)
+    loaded = time.perf_counter()
+    momentum, charge = compute_scores(arrays)
+    computed = time.perf_counter()
+    updated = 0 if args.dry_run else write_scores(conn, arrays['thread_ids'], momentum, charge)
+    written = time.perf_counter()
+    conn.close()
+
+    print(json.dumps({
+        "success": True,
+        "threads": len(arrays['thread_ids']),
+        "memberships": len(arrays['member_thread']),
+        "updated": updated,
+        "dry_run": args.dry_run,
+        "load_ms": round((loaded - started) * 1000, 1),
+        "compute_ms": round((computed - loaded) * 1000, 1),
+        "write_ms": round((written - computed) * 1000, 1),
+        "total_ms": round((written - started) * 1000, 1),
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Replay the dev fixture's arrival schedule against the event-driven exporter.
+
+Reads fixtures/dev-seed-notes.json and fixtures/dev-arrival-schedule.json
+(both written by scripts/generate-dev-fixture.py), inserts each note into a
+scratch database at its scheduled time - real time or N x accelerated - and
+fires `obsidian_export.py <noteId>` for it, the same call the webhook makes.
+Reports capture->vault latency percentiles overall and per day kind
+(burst / normal / recovery), so burst-day queueing shows up.
+
+Notes are inserted already processed (LLM + sentiment fields filled with
+seeded stand-ins): this measures the export path, not Ollama.
+
+Usage:
+    python3 scripts/replay-arrivals.py --db /tmp/replay.db --vault /tmp/replay-vault --speed 3600
+    python3 scripts/replay-arrivals.py --db /tmp/replay.db --vault /tmp/replay-vault \\
+        --from 2025-11-18 --to 2025-11-19 --speed 60 --concurrency 2
+
+Only runs against a fresh database (created from database/schema.sql and
+migrations) or one marked environment=test/development in _selene_metadata.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from dev_db import ENERGY_LEVELS, PROJECT_ROOT, SENTIMENTS, TONES, init_db, insert_processed_note  # noqa: E402
+
+EXPORTER = os.path.join(SCRIPT_DIR, "obsidian_export.py")
+
+THEMES_BY_TAG = {
+    "#mise": "mise", "#work": "work", "#api": "mise", "#meetings": "work",
+    "#ceramics": "ceramics", "#learning": "learning", "#adhd": "adhd",
+    "#health": "health", "#sleep": "health", "#exercise": "health",
+    "#joshua-tree": "travel", "#apartment": "home", "#social": "social",
+}
+
+
+# --- Database setup ---
+
+def check_scratch_db(db_path):
+    """Refuse to replay into anything that isn't a test/dev database."""
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute("SELECT value FROM _selene_metadata WHERE key = 'environment'").fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    conn.close()
+    if not row or row[0] not in ("test", "development"):
+        sys.exit(f"Refusing to replay into {db_path}: not marked as a test/development database")
+
+
+def insert_note(conn, note, run_id, seq, rng):
+    """Insert a captured note already processed and ready for export."""
+    # Fixture content repeats; the run id and sequence keep content_hash unique
+    content_hash = hashlib.sha256(f"{run_id}:{seq}:{note['content']}".encode()).hexdigest()
+    theme = next((THEMES_BY_TAG[t] for t in note["tags"] if t in THEMES_BY_TAG), "general")
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    raw_note_id = insert_processed_note(conn, {**note, "created_at": now}, content_hash, "replay", run_id, {
+        "concepts": [t.lstrip("#") for t in note["tags"]],
+        "primary_theme": theme,
+        "secondary_themes": [],
+        "sentiment_data": {"adhd_markers": {"overwhelm": rng.random() < 0.15},
+                           "key_emotions": [], "stress_indicators": rng.random() < 0.2,
+                           "analysis_confidence": 0.8},
+        "overall_sentiment": rng.choice(SENTIMENTS),
+        "sentiment_score": round(rng.random(), 2),
+        "emotional_tone": rng.choice(TONES),
+        "energy_level": rng.choice(ENERGY_LEVELS),
+    })
+    conn.commit()
+    return raw_note_id
+
+
+# --- Replay ---
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies):
+    values = sorted(latencies)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 1),
+        "p90_ms": round(percentile(values, 90) * 1000, 1),
+        "p95_ms": round(percentile(values, 95) * 1000, 1),
+        "p99_ms": round(percentile(values, 99) * 1000, 1),
+        "max_ms": round(values[-1] * 1000, 1),
+    }
+
+
+def export_note(raw_note_id, captured_at, env):
+    """Run the event-driven exporter for one note; return capture->vault seconds."""
+    result = subprocess.run(
+        [sys.executable, EXPORTER, str(raw_note_id)],
+        env=env, capture_output=True, text=True,
+    )
+    finished = time.monotonic()
+    ok = result.returncode == 0 and '"exported_count": 1' in result.stdout
+    if not ok:
+        print(f"Export failed for note {raw_note_id}: {result.stdout.strip()} {result.stderr.strip()}",
+              file=sys.stderr)
+    return ok, finished - captured_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay fixture arrivals against the Obsidian exporter")
+    parser.add_argument("--db", required=True, help="Scratch database (created if missing)")
+    parser.add_argument("--vault", required=True, help="Scratch vault directory")
+    parser.add_argument("--fixture", default=os.path.join(PROJECT_ROOT, "fixtures", "dev-seed-notes.json"))
+    parser.add_argument("--schedule", default=os.path.join(PROJECT_ROOT, "fixtures", "dev-arrival-schedule.json"))
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Acceleration factor (1 = real time, 3600 = an hour per second, 0 = no waiting)")
+    parser.add_argument("--from", dest="from_date", help="First capture date to replay (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_date", help="Last capture date to replay (YYYY-MM-DD)")
+    parser.add_argument("--limit", type=int, help="Replay at most this many arrivals")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Exporter calls allowed in flight at once (webhook worker pool)")
+    parser.add_argument("--report", help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    with open(args.fixture) as f:
+        notes = json.load(f)
+    with open(args.schedule) as f:
+        schedule = json.load(f)
+
+    if args.from_date:
+        schedule = [a for a in schedule if a["created_at"][:10] >= args.from_date]
+    if args.to_date:
+        schedule = [a for a in schedule if a["created_at"][:10] <= args.to_date]
+    if args.limit:
+        schedule = schedule[:args.limit]
+    if not schedule:
+        sys.exit("Nothing to replay")
+
+    if not os.path.exists(args.db):
+        init_db(args.db)
+    check_scratch_db(args.db)
+
+    env = dict(os.environ, SELENE_DB_PATH=args.db, OBSIDIAN_VAULT_PATH=args.vault)
+    env.pop("OBSIDIAN_VAULT_TARGETS", None)
+
+    rng = random.Random(42)
+    run_id = f"replay-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    conn = sqlite3.connect(args.db, timeout=30)
+
+    latencies = {}
+    failures = 0
+    lock = threading.Lock()
+
+    def on_done(kind, future):
+        nonlocal failures
+        ok, latency = future.result()
+        with lock:
+            if ok:
+                latencies.setdefault(kind, []).append(latency)
+            else:
+                failures += 1
+
+    base_offset = schedule[0]["offset_seconds"]
+    started = time.monotonic()
+    print(f"Replaying {len(schedule)} arrivals at {args.speed}x ({run_id})")
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for seq, arrival in enumerate(schedule):
+            if args.speed > 0:
+                due = started + (arrival["offset_seconds"] - base_offset) / args.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+            raw_note_id = insert_note(conn, notes[arrival["index"]], run_id, seq, rng)
+            captured_at = time.monotonic()
+            future = pool.submit(export_note, raw_note_id, captured_at, env)
+            future.add_done_callback(lambda fut, kind=arrival["day_kind"]: on_done(kind, fut))
+
+    conn.close()
+    elapsed = time.monotonic() - started
+
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    report = {
+        "run_id": run_id,
+        "arrivals": len(schedule),
+        "failures": failures,
+        "speed": args.speed,
+        "concurrency": args.concurrency,
+        "wall_seconds": round(elapsed, 2),
+        "overall": summarize(all_latencies),
+        "by_day_kind": {kind: summarize(values) for kind, values in sorted(latencies.items())},
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()